@@ -0,0 +1,48 @@
+"""
+Benchmark for typemacros.copy_type generated types.
+
+    python benchmarks/bench_copy_type.py
+
+Compares common operations on the raw base type, a default copy_type copy and a copy_type(..., fast=True) copy.
+"""
+from timeit import Timer
+
+from macrolibs.typemacros import copy_type
+
+
+Int = copy_type(int, 'BenchInt')
+FastInt = copy_type(int, 'BenchFastInt', fast=True)
+List = copy_type(list, 'BenchList')
+FastList = copy_type(list, 'BenchFastList', fast=True)
+
+CASES = {
+    'int + int': (lambda t: (t(7), t(5)), lambda a, b: a + b, (int, Int, FastInt)),
+    'int == int': (lambda t: (t(7), t(5)), lambda a, b: a == b, (int, Int, FastInt)),
+    'float(int)': (lambda t: (t(7), None), lambda a, b: float(a), (int, Int, FastInt)),
+    'len(list)': (lambda t: (t(range(100)), None), lambda a, b: len(a), (list, List, FastList)),
+    'list[i]': (lambda t: (t(range(100)), 50), lambda a, b: a[b], (list, List, FastList)),
+    'list[i:j]': (lambda t: (t(range(100)), slice(10, 20)), lambda a, b: a[b], (list, List, FastList)),
+    'x in list': (lambda t: (t(range(100)), 50), lambda a, b: b in a, (list, List, FastList)),
+}
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def main():
+    print(f"{'operation':<14} {'base (ns)':>10} {'copy_type (ns)':>15} {'fast (ns)':>10}")
+    for name, (make, op, types) in CASES.items():
+        times = []
+        for t in types:
+            a, b = make(t)
+            times.append(best_of(lambda: op(a, b)) * 1e9)
+        print(f"{name:<14} {times[0]:>10.1f} {times[1]:>15.1f} {times[2]:>10.1f}")
+
+    print(f"\ninstance __dict__: copy_type {hasattr(Int(7), '__dict__')}, fast {hasattr(FastInt(7), '__dict__')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark for typemacros.maybe_arg against the previous exception driven implementation.
+
+    python benchmarks/bench_maybe_arg.py
+
+The old wrapper called the function, parsed the TypeError message and retried with one argument less,
+so its cost grows with the number of surplus arguments.  The current wrapper replays a cached binding plan.
+The cases below are covered with expected results in tests/test_typemacros.py.
+"""
+import inspect
+from timeit import Timer
+
+from macrolibs.typemacros import maybe_arg, dict_compliment
+
+
+def legacy_maybe_arg(func, pass_to_kwargs= False):
+    """maybe_arg as it was before binding plans (kept here as the baseline)."""
+    POSITIONAL_OR_KEYWORD = inspect.Parameter.POSITIONAL_OR_KEYWORD
+    EMPTY = inspect.Parameter.empty
+    VAR_POSITIONAL = inspect.Parameter.VAR_POSITIONAL
+
+    params = inspect.signature(func).parameters.items()
+    required_pars = tuple(par for _, par in params
+                          if par.kind in (POSITIONAL_OR_KEYWORD, VAR_POSITIONAL) and par.default is EMPTY)
+
+    def wrapper(*args, **kwargs):
+        args = args if pass_to_kwargs or not required_pars or required_pars[-1].kind is VAR_POSITIONAL \
+            else args[:len(required_pars)]
+        try:
+            return func(*args, **kwargs)
+        except TypeError as e:
+            s = str(e)
+            if ("positional argument" in s and "given" in s) or "multiple values " in s:
+                return wrapper(*args[:-1], **kwargs)
+            elif "keyword argument '" in s:
+                pos = s.index("keyword argument '") + 18
+                k = s[pos:][:s[pos:].index("\'")]
+                return wrapper(*args, **dict_compliment(kwargs,{k:kwargs[k]}))
+            else:
+                raise e
+
+    return wrapper
+
+
+def exact(old, new, parents):
+    return new
+
+def no_parents(old, new):
+    return new
+
+def defaults(old=None, new=None):
+    return new
+
+def only_old(old):
+    return old
+
+
+CASES = {
+    'exact signature': (exact, (1, 2), {'parents': []}),
+    'surplus kwarg': (no_parents, (1, 2), {'parents': []}),
+    'surplus args + kwarg (pass_to_kwargs)': (defaults, (1, 2, 3, 4), {'parents': []}),
+    'surplus args + kwargs': (only_old, (1, 2, 3), {'parents': [], 'depth': 0}),
+}
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def main():
+    print(f"{'case':<40} {'legacy (us)':>12} {'planned (us)':>13} {'speedup':>9}")
+    for name, (func, args, kwargs) in CASES.items():
+        pass_to_kwargs = 'pass_to_kwargs' in name
+        legacy = legacy_maybe_arg(func, pass_to_kwargs)
+        planned = maybe_arg(func, pass_to_kwargs)
+        assert legacy(*args, **kwargs) == planned(*args, **kwargs)
+        t_legacy = best_of(lambda: legacy(*args, **kwargs))
+        t_planned = best_of(lambda: planned(*args, **kwargs))
+        print(f"{name:<40} {t_legacy * 1e6:>12.2f} {t_planned * 1e6:>13.2f} {t_legacy / t_planned:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Crossover benchmark for the NumPy fast path of the typemacros set operations.
+
+    python benchmarks/bench_vectorize.py
+
+Times list_intersect, list_compliment and list_union with vectorize=False (generic hashable_repr path) and
+vectorize=True (NumPy kernels) over growing input sizes, and reports the first size at which NumPy wins.
+(int and float cross over at roughly 64-128 items; str never does, so it is only vectorized when forced)
+"""
+import random
+from timeit import Timer
+
+from macrolibs.typemacros import list_intersect, list_compliment, list_union
+
+
+SIZES = (16, 64, 128, 256, 512, 1024, 4096, 16384)
+
+GENERATORS = {
+    'int': lambda n: [random.randrange(n) for _ in range(n)],
+    'float': lambda n: [random.randrange(n) / 4 for _ in range(n)],
+    'str': lambda n: [f"key{random.randrange(n)}" for _ in range(n)],
+}
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def main():
+    for op in (list_intersect, list_compliment, list_union):
+        for kind, gen in GENERATORS.items():
+            print(f"\n{op.__name__} [{kind}]")
+            print(f"{'size':>8} {'generic (us)':>14} {'numpy (us)':>12} {'speedup':>9}")
+            crossover = None
+            for n in SIZES:
+                A, B = gen(n), gen(n // 2)
+                generic = best_of(lambda: op(A, B, vectorize=False))
+                vector = best_of(lambda: op(A, B, vectorize=True))
+                if crossover is None and vector < generic:
+                    crossover = n
+                print(f"{n:>8} {generic * 1e6:>14.1f} {vector * 1e6:>12.1f} {generic / vector:>8.2f}x")
+            print(f"crossover: {crossover}")
+
+
+if __name__ == '__main__':
+    main()
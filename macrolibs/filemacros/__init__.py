@@ -1,2 +1,3 @@
 from .filemacros import *
-from .jsonmacros import *
\ No newline at end of file
+from .jsonmacros import *
+from .snapshotmacros import *
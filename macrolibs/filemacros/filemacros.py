@@ -1,4 +1,5 @@
-import sys, os, inspect
+import sys, os, re, fnmatch
+from concurrent.futures import ThreadPoolExecutor
 
 
 #Script Macros
@@ -6,18 +7,39 @@ import sys, os, inspect
 
 def get_script_dir() -> str:
     """Returns the directory of the current script if compiled via pyinstaller or not, ran from anywhere."""
-    # Get the stack frame of the caller
-    frame = inspect.stack()[1]
+    return caller_dir(1)
 
-    # Get the file path of the caller
-    caller_file_path = frame.filename
 
-    # If the caller is a script and not a compiled executable
-    if not getattr(sys, 'frozen', False): # Check if the app is not frozen (not compiled with PyInstaller)
-        return os.path.dirname(os.path.abspath(caller_file_path))
+def caller_frame(depth: int = 1):
+    """
+    Returns the frame 'depth' levels above the function calling caller_frame (1 = that function's caller).
+    Only the one frame is touched, unlike inspect.stack() which builds FrameInfo (and reads source) for every level.
+    """
+    return sys._getframe(depth + 1)
 
+
+_CALLER_DIRS = {}   #{code object: resolved directory}
+
+def caller_dir(depth: int = 1) -> str:
+    """
+    Directory of the file that the frame 'depth' levels above the calling function belongs to.
+    Resolved directories are cached per code object.  Inside a PyInstaller executable this is the executable's dir.
+    """
     # If the caller is a compiled executable
-    return os.path.dirname(sys.executable)
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+
+    code = sys._getframe(depth + 1).f_code
+    try:
+        return _CALLER_DIRS[code]
+    except KeyError:
+        pass
+
+    path = os.path.dirname(os.path.abspath(code.co_filename))
+    #Relative filenames depend on the cwd at call time, so only absolute ones are cached
+    if os.path.isabs(code.co_filename):
+        _CALLER_DIRS[code] = path
+    return path
 
 
 #Search Macros
@@ -25,11 +47,91 @@ def get_script_dir() -> str:
 
 def full_walk(dir_path: str) -> list:
     """Returns list of full paths from an os.walk"""
-    L = []
+    return list(iter_walk(dir_path))
+
+
+def iter_walk(dir_path: str, include = None, exclude = None, max_depth: int | None = None, min_depth: int = 0,
+              workers: int | None = None, entries: bool = False, stat: bool = False, follow_links: bool = False):
+    """
+    Yields full paths of all files under dir_path as they are found, in the same order as full_walk.
+    Built on os.scandir; nothing is collected up front.
+
+    'include' / 'exclude' are fnmatch patterns (or lists of them) tested against entry names during traversal:
+    excluded directories are never opened, and only files matching 'include' are yielded.
+    Files directly in dir_path are at depth 0; directories deeper than 'max_depth' are not scanned and
+    files shallower than 'min_depth' are not yielded.
+
+    'workers' scans directories ahead of the consumer in a thread pool (helps on network/overlay filesystems).
+    'entries=True' yields the os.DirEntry objects instead of paths, so callers can use entry.stat() without
+    re-statting; 'stat=True' fills that stat cache in the scanning thread.
+    """
+    include, exclude = _pattern(include), _pattern(exclude)
+    scan = lambda path, depth: _scan_dir(path, depth, include, exclude, min_depth, stat, follow_links)
+    descend = lambda depth: max_depth is None or depth < max_depth
+    get = (lambda entry: entry) if entries else (lambda entry: entry.path)
+
+    if not workers:
+        stack = [(os.fspath(dir_path), 0)]
+        while stack:
+            path, depth = stack.pop()
+            files, dirs = scan(path, depth)
+            yield from map(get, files)
+            if descend(depth):
+                stack.extend((entry.path, depth + 1) for entry in reversed(dirs))
+        return
+
+    #Subdirectories are submitted as soon as their parent is listed; results are consumed depth-first
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        stack = [(executor.submit(scan, os.fspath(dir_path), 0), 0)]
+        try:
+            while stack:
+                future, depth = stack.pop()
+                files, dirs = future.result()
+                yield from map(get, files)
+                if descend(depth):
+                    stack.extend([(executor.submit(scan, entry.path, depth + 1), depth + 1) for entry in dirs][::-1])
+        finally:
+            for future, _ in stack:
+                future.cancel()
+
+
+def _pattern(patterns):
+    """Compiles one or more fnmatch patterns into a single matcher (None for no patterns)."""
+    if patterns is None:
+        return None
+    if isinstance(patterns, (str, bytes)):
+        patterns = (patterns,)
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns)).match
+
+
+def _scan_dir(path: str, depth: int, include, exclude, min_depth: int, stat: bool, follow_links: bool) -> tuple:
+    """Lists one directory, returning (files, dirs) as DirEntry lists with filters applied."""
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as it:
+            listing = list(it)
+    except OSError:
+        return files, dirs
+
+    for entry in listing:
+        name = os.path.normcase(entry.name)
+        if exclude and exclude(name):
+            continue
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
 
-    for root, dirs, files in os.walk(dir_path):
-        for file in files:
-            full_path = os.path.join(root, file)
-            L.append(full_path)
+        if is_dir:
+            #Like os.walk, symlinked directories are neither yielded nor followed by default
+            if follow_links or not entry.is_symlink():
+                dirs.append(entry)
+        elif depth >= min_depth and (include is None or include(name)):
+            if stat:
+                try:
+                    entry.stat()
+                except OSError:
+                    pass
+            files.append(entry)
 
-    return L
\ No newline at end of file
+    return files, dirs
@@ -1,28 +1,491 @@
-import os, json
+import os, json, re, shutil, time, threading, atexit
+from stat import S_IMODE
+from collections import OrderedDict
+from types import MappingProxyType
+from json.decoder import scanstring
+from typing import Any
+from ..typemacros.typemacros import maybe_arg
+from ..typemacros._replace_value import _compile_matcher, _MISS, BREAK_SEARCH
 
 
-def open_json(path: str, default = {}) -> dict:
+def open_json(path: str, default = {}, cache: bool = False, frozen: bool = False) -> dict:
     """
     Attempts to open a json file and returns its contents as a dict.
     If the file does not exist, a new one will be created with 'default'
+
+    'cache=True' serves repeat opens from the process-wide json_cache while the file's (mtime_ns, size) is unchanged.
+    The cached object is shared between callers, so don't mutate it; 'frozen=True' (implies cache) returns a
+    read-only view instead (dicts become MappingProxyType, lists become tuples).
     """
+    if cache or frozen:
+        data = json_cache.get(path, frozen)
+        if data is not _MISS:
+            return data
+
     if not os.path.exists(path):
         with open(path, "x"):
             pass
     with open(path, "r") as file:
+        stat = os.fstat(file.fileno())
         content = file.read()
         if content.strip():
             data = json.loads(content)
         else:
-            data = default
+            return default
     file.close()
+
+    if cache or frozen:
+        return json_cache.put(path, stat, data, frozen)
     return data
 
 
-def save_json(data: dict, path: str) -> None:
-    """Saves a json file"""
-    with open(path, "w") as file:
-        json.dump(data, file)
-    file.close()
+def save_json(data: dict, path: str, atomic: bool = False, fsync: bool = False, background: bool = False) -> None:
+    """
+    Saves a json file
+
+    'atomic=True' writes a temp file next to 'path' and renames it over the target, so readers and crashes never
+    see a truncated file.  'fsync=True' also forces the data to disk before the rename.
+    'background=True' hands the (already encoded) data to the json_saver thread and returns immediately;
+    repeated saves to the same path are coalesced so only the latest is written.  Use json_saver.flush() to wait.
+    """
+    if background:
+        json_saver.save(data, path, fsync)
+        return
+    if atomic or fsync:
+        _write_atomic(path, json.dumps(data), fsync)
+    else:
+        with open(path, "w") as file:
+            json.dump(data, file)
+        file.close()
+    json_cache.invalidate(path)
+
+
+
+#Parse Cache
+#----------------------------------------------------------------------------------------------------------------------
+
+class JsonCache():
+    """
+    Process-wide LRU cache of parsed json files for open_json, validated by (mtime_ns, size) on every lookup.
+    'max_bytes' budgets the total on-disk size of cached files; least recently used entries are evicted past it.
+    """
+    RACY_NS = 1_000_000_000   #Files modified this recently are not cached (a same-size rewrite could share the mtime)
+
+    def __init__(self, max_bytes: int = 64 << 20):
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()   #{abspath: [(mtime_ns, size), data, frozen data | None]}
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str, frozen: bool = False):
+        """Returns the cached contents of 'path', or _MISS if it is absent or stale."""
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            self.invalidate(key)
+            return _MISS
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != (st.st_mtime_ns, st.st_size):
+                self.misses += 1
+                return _MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if frozen:
+                if entry[2] is None:
+                    entry[2] = _freeze(entry[1])
+                return entry[2]
+            return entry[1]
+
+    def put(self, path: str, stat: os.stat_result, data, frozen: bool = False):
+        """Caches 'data' parsed from 'path' as of 'stat' and returns it (frozen if requested)."""
+        view = _freeze(data) if frozen else None
+        key = os.path.abspath(path)
+        size = stat.st_size
+
+        with self._lock:
+            self._pop(key)
+            if size <= self.max_bytes and time.time_ns() - stat.st_mtime_ns > self.RACY_NS:
+                self._entries[key] = [(stat.st_mtime_ns, size), data, view]
+                self._nbytes += size
+                while self._nbytes > self.max_bytes:
+                    self._pop(next(iter(self._entries)))
+
+        return view if frozen else data
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._pop(os.path.abspath(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries),
+                'bytes': self._nbytes, 'max_bytes': self.max_bytes}
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry[0][1]
+
+
+def _freeze(obj):
+    """Read-only copy of parsed json: dicts become MappingProxyType and lists become tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+json_cache = JsonCache()
+
+
+
+
+#Write-Behind Saving
+#----------------------------------------------------------------------------------------------------------------------
+
+class JsonSaver():
+    """
+    Background writer for save_json(background=True).  Data is encoded by the caller (so later mutation is safe)
+    and queued by path; a path saved again before it was written only keeps its latest contents.
+    Every write is atomic (temp file + os.replace).  'delay' seconds of extra coalescing are waited before each
+    batch; 'fsync' is the default fsync policy.  Pending saves are flushed at interpreter exit; saves made after
+    close() (e.g. from other atexit handlers) are written synchronously instead.
+    """
+    def __init__(self, delay: float = 0.0, fsync: bool = False):
+        self.delay = delay
+        self.fsync = fsync
+        self._pending = {}   #{abspath: (text, fsync)}
+        self._writing = 0
+        self._error = None
+        self._closed = False
+        self._thread = None
+        self._cond = threading.Condition()
+
+    def save(self, data, path: str, fsync: bool | None = None) -> None:
+        """Queues 'data' to be written to 'path'."""
+        text = json.dumps(data)
+        key = os.path.abspath(path)
+        fsync = self.fsync if fsync is None else fsync
+        with self._cond:
+            closed = self._closed
+            if not closed:
+                self._pending[key] = (text, fsync)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='JsonSaver', daemon=True)
+                    self._thread.start()
+                    atexit.register(self.close)
+                self._cond.notify_all()
+        if closed:
+            _write_atomic(key, text, fsync)
+        json_cache.invalidate(key)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until everything queued so far has been written.  Returns False on timeout.
+        Re-raises the first error a background write hit since the last flush.
+        """
+        with self._cond:
+            done = self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+        return done
+
+    def close(self, timeout: float | None = None) -> None:
+        """Flushes pending saves and stops the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        atexit.unregister(self.close)
+        with self._cond:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
 
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+            if self.delay and not self._closed:
+                time.sleep(self.delay)
+
+            with self._cond:
+                batch, self._pending = self._pending, {}
+                self._writing = len(batch)
+
+            for path, (text, fsync) in batch.items():
+                try:
+                    _write_atomic(path, text, fsync)
+                except Exception as e:
+                    with self._cond:
+                        self._error = self._error or e
+                json_cache.invalidate(path)
+
+            with self._cond:
+                self._writing = 0
+                self._cond.notify_all()
+
+
+def _write_atomic(path: str, text: str, fsync: bool = False) -> None:
+    """Writes 'text' to a temp file in the same directory and renames it over 'path'."""
+    path = os.path.abspath(path)
+    directory, name = os.path.split(path)
+    fd, tmp_path = _create_temp(directory, name)
+    try:
+        with os.fdopen(fd, "w") as file:
+            file.write(text)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        _replace_temp(tmp_path, path)
+    except BaseException:
+        _remove_temp(tmp_path)
+        raise
+
+    if fsync and hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _replace_temp(tmp_path: str, path: str) -> None:
+    """Renames a finished temp file over 'path', keeping the target's mode if it exists."""
+    #New files get 0666 & ~umask from os.open, like open()
+    try:
+        os.chmod(tmp_path, S_IMODE(os.stat(path).st_mode))
+    except FileNotFoundError:
+        pass
+    os.replace(tmp_path, path)
+
+
+def _remove_temp(tmp_path: str) -> None:
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+def _create_temp(directory: str, name: str) -> tuple:
+    """Exclusively creates a hidden temp file next to 'name' with the default file mode; returns (fd, path)."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    for _ in range(100):
+        tmp_path = os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp")
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No usable temp file name for {name!r} in {directory!r}")
+
+
+json_saver = JsonSaver()
+
+
+#Streaming
+#----------------------------------------------------------------------------------------------------------------------
+
+_WHITESPACE = ' \t\n\r'
+_LITERAL = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false|null')
+_CONSTANTS = {'true': True, 'false': False, 'null': None}
+#Everything up to the next structural character or whitespace is one literal token
+_TOKEN = re.compile(r'[^ \t\n\r,:\[\]{}"]*')
+#Token texts that more input could still turn into a valid literal
+_LITERAL_PREFIX = re.compile(r'-?(?:(?:0|[1-9]\d*)(?:\.(?:\d+(?:[eE][-+]?\d*)?)?|[eE][-+]?\d*)?)?'
+                             r'|t(?:r(?:ue?)?)?|f(?:a(?:l(?:se?)?)?)?|n(?:u(?:ll?)?)?')
+_MAX_ESCAPE = 6   #Longest escape sequence: \uXXXX
+
+
+def replace_json_stream(
+        src_path: str, 
+        dst_path: str, 
+        old_vals: tuple | Any = (), 
+        new_val = None, 
+        callback = None,
+        replace_map: dict | list[tuple] | None = None,
+        chunk_size: int = 1 << 16
+    ) -> int:
+    """
+    Streaming version of replace_value_nested for json files.  'src_path' is tokenized incrementally and written
+    to 'dst_path' as it goes, so memory is bounded by 'chunk_size' plus the largest single string or number in
+    the file.  Returns the number of values replaced.
+
+    Strings, numbers, booleans and nulls in value position (array items, object values, or the whole document) are
+    matched against 'old_vals' / 'replace_map' exactly like replace_value_nested; object keys are never replaced.
+    Everything that is not replaced is copied through byte for byte, including whitespace.
+
+    The callback and BREAK_SEARCH work as in replace_value_nested, except that 'parents' is not available in a
+    stream.  Instead the callback may accept a 'path' keyword: the tuple of object keys and array indices leading
+    to the value.
+
+    def callback(old, new, path):
+        return new if path[:1] == ('users',) else old
+    """
+    match = _compile_matcher(old_vals, new_val, replace_map)
+    callback = maybe_arg(callback) if callback is not None else lambda old, new, path: new
+
+    #Written to a temp file and renamed at the end, so 'dst_path' may be 'src_path' and a failed parse leaves no
+    #half-written output behind
+    dst_path = os.path.abspath(dst_path)
+    fd, tmp_path = _create_temp(*os.path.split(dst_path))
+    try:
+        with open(src_path, 'r', encoding='utf-8', newline='') as src, \
+                open(fd, 'w', encoding='utf-8', newline='') as dst:
+            count = _JsonStream(src, dst, match, callback, chunk_size).run()
+        _replace_temp(tmp_path, dst_path)
+    except BaseException:
+        _remove_temp(tmp_path)
+        raise
+    json_cache.invalidate(dst_path)
+    return count
+
+
+class _JsonStream():
+    """Incremental json tokenizer that copies 'src' to 'dst' and swaps out matched scalar values."""
+    def __init__(self, src, dst, match, callback, chunk_size: int):
+        self.src, self.dst = src, dst
+        self.match, self.callback = match, callback
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0        # next character to tokenize
+        self.written = 0    # buf[:written] is already in dst
+        self.eof = False
+        self.replaced = 0
+
+    def fill(self, at_least: int = 0) -> bool:
+        """Flushes the finished part of the buffer and reads more.  Returns False at end of file."""
+        if self.eof:
+            return False
+        self.dst.write(self.buf[self.written:self.pos])
+        self.buf = self.buf[self.pos:]
+        self.pos = self.written = 0
+        data = self.src.read(max(self.chunk_size, at_least))
+        if not data:
+            self.eof = True
+            return False
+        self.buf += data
+        return True
+
+    def error(self, msg: str):
+        return json.JSONDecodeError(msg, self.buf, self.pos)
+
+    def run(self) -> int:
+        # [kind, key or index] per open container; 'expect_key' is set between '{' / ',' and a key in objects
+        stack = []
+        expect_key = False
+        broken = False
+
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos >= len(self.buf):
+                if self.fill():
+                    continue
+                break
+            if broken:
+                #Nothing else can change: copy the rest through
+                self.dst.write(self.buf[self.written:])
+                self.buf, self.pos, self.written = '', 0, 0
+                shutil.copyfileobj(self.src, self.dst)
+                break
+
+            c = self.buf[self.pos]
+            if c == '{':
+                stack.append(['{', None])
+                expect_key = True
+                self.pos += 1
+            elif c == '[':
+                stack.append(['[', 0])
+                self.pos += 1
+            elif c in '}]':
+                if not stack:
+                    raise self.error("Unexpected closing bracket")
+                stack.pop()
+                expect_key = False
+                self.pos += 1
+            elif c == ',':
+                if stack and stack[-1][0] == '{':
+                    expect_key = True
+                elif stack:
+                    stack[-1][1] += 1
+                self.pos += 1
+            elif c == ':':
+                self.pos += 1
+            elif c == '"':
+                value, end = self.scan_string()
+                if expect_key:
+                    #Object keys are only tracked for 'path', never replaced
+                    stack[-1][1] = value
+                    expect_key = False
+                    self.pos = end
+                else:
+                    broken = self.visit(value, end, stack)
+            else:
+                value, end = self.scan_literal()
+                broken = self.visit(value, end, stack)
+
+        self.dst.write(self.buf[self.written:])
+        return self.replaced
+
+    def scan_string(self) -> tuple:
+        while True:
+            try:
+                return scanstring(self.buf, self.pos + 1)
+            except json.JSONDecodeError as e:
+                #Only a string (or an escape in it) cut off by the end of the buffer can still become valid;
+                #anything else is malformed and raised right away instead of reading on to EOF
+                if not (e.msg.startswith('Unterminated string') or len(self.buf) - e.pos <= _MAX_ESCAPE):
+                    raise
+                #Read more, growing geometrically
+                if not self.fill(len(self.buf)):
+                    raise
+
+    def scan_literal(self) -> tuple:
+        while True:
+            end = _TOKEN.match(self.buf, self.pos).end()
+            text = self.buf[self.pos:end]
+            #A literal is only complete once a delimiter follows it ("1" may still become "1.5")
+            if end < len(self.buf) or self.eof:
+                break
+            if not _LITERAL_PREFIX.fullmatch(text):
+                raise self.error("Expecting value")
+            self.fill(len(self.buf))
+
+        if not _LITERAL.fullmatch(text):
+            raise self.error("Expecting value")
+        if text in _CONSTANTS:
+            value = _CONSTANTS[text]
+        elif '.' in text or 'e' in text or 'E' in text:
+            value = float(text)
+        else:
+            value = int(text)
+        return value, end
 
+    def visit(self, value, end: int, stack: list) -> bool:
+        """Replaces the value spanning buf[pos:end] if it matches.  Returns True on BREAK_SEARCH."""
+        start, self.pos = self.pos, end
+        new_val = self.match(value)
+        if new_val is _MISS:
+            return False
+        new_value = self.callback(value, new_val, path = tuple(entry[1] for entry in stack))
+        if new_value is BREAK_SEARCH:
+            return True
+        self.dst.write(self.buf[self.written:start])
+        self.dst.write(json.dumps(new_value))
+        self.written = end
+        self.replaced += 1
+        return False
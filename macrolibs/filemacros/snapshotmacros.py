@@ -0,0 +1,187 @@
+import os, json, gzip, time
+from collections import namedtuple
+from .filemacros import _pattern
+
+
+SnapshotDiff = namedtuple('SnapshotDiff', ['added', 'removed', 'modified'])
+
+_VERSION = 1
+_RACY = -1                 #Stored in place of a directory mtime that is too recent to trust
+_RACY_NS = 2_000_000_000   #Coarsest common filesystem timestamp granularity (FAT: 2s)
+
+
+#Snapshots
+#----------------------------------------------------------------------------------------------------------------------
+
+class DirSnapshot:
+    """
+    Compact record of the files under 'root' (mtime_ns, size, inode) for cheap repeated change detection.
+
+    scan() returns a SnapshotDiff of full paths that were added, removed or modified since the previous scan
+    (everything is 'added' on the first one).  Directories whose own mtime has not changed are not re-listed,
+    since adding, removing or renaming an entry always updates it; only their subdirectories are stat'ed.
+
+    Editing a file in place does NOT touch its directory's mtime, so modifications inside unchanged directories
+    are only seen with scan(check_files=True), which re-stats every recorded file (still no directory listing).
+
+    'include' / 'exclude' are fnmatch patterns as in iter_walk.
+    """
+    def __init__(self, root: str, include = None, exclude = None):
+        self.root = os.fspath(root)
+        self.include = _patterns(include)
+        self.exclude = _patterns(exclude)
+        self._dirs = {}   #{rel_dir: [dir_mtime_ns, {name: [mtime_ns, size, ino]}, [subdir names]]}
+
+    def scan(self, check_files: bool = False) -> SnapshotDiff:
+        """Rescans the tree, updates the snapshot and returns what changed."""
+        include, exclude = _pattern(self.include), _pattern(self.exclude)
+        added, removed, modified = [], [], []
+        new_dirs = {}
+        now = time.time_ns()
+
+        stack = ['']
+        while stack:
+            rel = stack.pop()
+            dir_path = os.path.join(self.root, rel)
+            old = self._dirs.get(rel)
+            try:
+                dir_mtime = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                continue
+
+            if old is not None and old[0] == dir_mtime:
+                files, subdirs = old[1], old[2]
+                if check_files:
+                    self._restat(dir_path, files, removed, modified)
+            else:
+                files, subdirs = self._list(dir_path, include, exclude)
+                self._compare(dir_path, old[1] if old else {}, files, added, removed, modified)
+
+            new_dirs[rel] = [dir_mtime if now - dir_mtime > _RACY_NS else _RACY, files, subdirs]
+            stack.extend(os.path.join(rel, name) for name in reversed(subdirs))
+
+        #Directories that disappeared take all of their files with them
+        for rel, (_, files, _) in self._dirs.items():
+            if rel not in new_dirs:
+                removed.extend(os.path.join(self.root, rel, name) for name in files)
+
+        self._dirs = new_dirs
+        return SnapshotDiff(added, removed, modified)
+
+    def paths(self) -> list:
+        """Full paths of all recorded files in full_walk order."""
+        L = []
+        stack = ['']
+        while stack:
+            rel = stack.pop()
+            if rel not in self._dirs:
+                continue
+            _, files, subdirs = self._dirs[rel]
+            L.extend(os.path.join(self.root, rel, name) for name in files)
+            stack.extend(os.path.join(rel, name) for name in reversed(subdirs))
+        return L
+
+    def __len__(self) -> int:
+        return sum(len(files) for _, files, _ in self._dirs.values())
+
+    #Persistence
+    #-----------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Writes the snapshot as gzipped json."""
+        data = {'version': _VERSION, 'root': self.root, 'include': self.include, 'exclude': self.exclude,
+                'dirs': self._dirs}
+        tmp_path = path + '.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as file:
+            json.dump(data, file, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'DirSnapshot':
+        """Reads a snapshot written by save()."""
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            data = json.load(file)
+        if data.get('version') != _VERSION:
+            raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+        snapshot = cls(data['root'], data['include'], data['exclude'])
+        snapshot._dirs = data['dirs']
+        return snapshot
+
+    #Helpers
+    #-----------------------------------------------
+
+    @staticmethod
+    def _list(dir_path: str, include, exclude) -> tuple:
+        """Lists one directory into ({name: [mtime_ns, size, ino]}, [subdir names])."""
+        files, subdirs = {}, []
+        try:
+            with os.scandir(dir_path) as it:
+                listing = list(it)
+        except OSError:
+            return files, subdirs
+
+        for entry in listing:
+            name = os.path.normcase(entry.name)
+            if exclude and exclude(name):
+                continue
+            try:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.name)
+                    continue
+                if include is None or include(name):
+                    st = entry.stat()
+                    files[entry.name] = [st.st_mtime_ns, st.st_size, st.st_ino]
+            except OSError:
+                continue
+
+        return files, subdirs
+
+    @staticmethod
+    def _compare(dir_path: str, old: dict, new: dict, added: list, removed: list, modified: list) -> None:
+        for name, record in new.items():
+            previous = old.get(name)
+            if previous is None:
+                added.append(os.path.join(dir_path, name))
+            elif previous != record:
+                modified.append(os.path.join(dir_path, name))
+        removed.extend(os.path.join(dir_path, name) for name in old if name not in new)
+
+    @staticmethod
+    def _restat(dir_path: str, files: dict, removed: list, modified: list) -> None:
+        for name, record in list(files.items()):
+            path = os.path.join(dir_path, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                del files[name]
+                removed.append(path)
+                continue
+            current = [st.st_mtime_ns, st.st_size, st.st_ino]
+            if current != record:
+                files[name] = current
+                modified.append(path)
+
+
+def _patterns(patterns):
+    """Normalizes pattern arguments to their json round-trip form."""
+    return patterns if patterns is None or isinstance(patterns, str) else list(patterns)
+
+
+def walk_changes(dir_path: str, snapshot_path: str, include = None, exclude = None,
+                 check_files: bool = False) -> SnapshotDiff:
+    """
+    Compares dir_path against the snapshot stored at snapshot_path, saves the updated snapshot
+    and returns the SnapshotDiff.  Everything is reported as added if there is no snapshot yet.
+    """
+    if os.path.exists(snapshot_path):
+        snapshot = DirSnapshot.load(snapshot_path)
+        settings = (os.fspath(dir_path), _patterns(include), _patterns(exclude))
+        if (snapshot.root, snapshot.include, snapshot.exclude) != settings:
+            snapshot = DirSnapshot(dir_path, include, exclude)
+    else:
+        snapshot = DirSnapshot(dir_path, include, exclude)
+
+    diff = snapshot.scan(check_files)
+    snapshot.save(snapshot_path)
+    return diff
@@ -1 +1,5 @@
-from .misc import *
\ No newline at end of file
+from .misc import *
+from .benchmark import *
+from .sampling import *
+from .metrics import *
+from .memoize import *
@@ -0,0 +1,196 @@
+import cProfile
+import pstats
+import tracemalloc
+import platform
+import json
+import math
+import time
+from ..filemacros.filemacros import caller_frame
+
+
+
+def benchmark(target, repeat: int = 5, number: int = 1, warmup: int = 1, profile: bool = True,
+              memory: bool = True, name: str | None = None) -> 'BenchmarkResult':
+    """
+    Repeatable, programmatic counterpart to profile_run.
+
+    Parameters:
+    - target (callable | str): A zero-argument callable, or code to exec in the caller's globals.
+    - repeat (int): Number of timed samples.
+    - number (int): Calls per sample; each sample records the mean time per call.
+    - warmup (int): Untimed calls made first (caches, imports, lazy initialization).
+    - profile (bool): Collect per-function stats from one extra cProfile'd sample.
+    - memory (bool): Record peak traced allocation (tracemalloc) over one extra sample.
+
+    Timing samples run without the profiler or tracemalloc active, so neither skews the distribution.
+    """
+    if repeat < 1 or number < 1:
+        raise ValueError("benchmark needs at least one repeat of one call")
+
+    if isinstance(target, str):
+        code = compile(target, '<benchmark>', 'exec')
+        caller_globals = caller_frame(1).f_globals
+        func = lambda: exec(code, caller_globals, {})
+        name = name or target
+    else:
+        func = target
+        name = name or getattr(target, '__qualname__', repr(target))
+
+    for _ in range(warmup):
+        func()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter_ns() - start) / number / 1e9)
+
+    peak = None
+    if memory:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        for _ in range(number):
+            func()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        if not tracing:
+            tracemalloc.stop()
+
+    functions = []
+    if profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        for _ in range(number):
+            func()
+        profiler.disable()
+        functions = _function_stats(profiler, number)
+
+    return BenchmarkResult(name, times, number, peak, functions)
+
+
+def _function_stats(profiler: cProfile.Profile, number: int) -> list:
+    """Per-function stats straight from pstats (per benchmarked call), sorted by cumulative time."""
+    stats = pstats.Stats(profiler)
+    functions = []
+    for (filename, line, func_name), (primcalls, ncalls, tottime, cumtime, _) in stats.stats.items():
+        functions.append({
+            'function': f"{filename}:{line}({func_name})",
+            'ncalls': ncalls / number,
+            'primcalls': primcalls / number,
+            'tottime': tottime / number,
+            'cumtime': cumtime / number,
+        })
+    functions.sort(key=lambda f: f['cumtime'], reverse=True)
+    return functions
+
+
+
+#Results
+#----------------------------------------------------------------------------------------------------------------------
+
+class BenchmarkResult():
+    """
+    Outcome of benchmark(): per-call wall times in seconds ('times'), peak traced allocation in bytes
+    ('peak_bytes', None if not measured) and per-function profile stats ('functions').
+    """
+    def __init__(self, name: str, times: list, number: int, peak_bytes: int | None, functions: list,
+                 python: str | None = None):
+        self.name = name
+        self.times = list(times)
+        self.number = number
+        self.peak_bytes = peak_bytes
+        self.functions = functions
+        self.python = python or platform.python_version()
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+
+    @property
+    def mean(self) -> float:
+        return sum(self.times) / len(self.times)
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile of the per-call times (median interpolates for even counts)."""
+        s = sorted(self.times)
+        if q == 50 and len(s) % 2 == 0:
+            return (s[len(s) // 2 - 1] + s[len(s) // 2]) / 2
+        return s[max(math.ceil(q / 100 * len(s)) - 1, 0)]
+
+    #Export
+    #-----------------------------------------------
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name, 'python': self.python, 'number': self.number, 'times': self.times,
+            'min': self.min, 'median': self.median, 'p95': self.p95, 'mean': self.mean,
+            'peak_bytes': self.peak_bytes, 'functions': self.functions,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BenchmarkResult':
+        return cls(data['name'], data['times'], data['number'], data['peak_bytes'], data['functions'],
+                   data.get('python'))
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'BenchmarkResult':
+        with open(path, 'r') as file:
+            return cls.from_dict(json.load(file))
+
+    #Comparison
+    #-----------------------------------------------
+
+    def compare(self, baseline, stat: str = 'median', tolerance: float = 0.10) -> dict:
+        """
+        Compares against a baseline (BenchmarkResult, its dict, or a saved json path).
+        'regression' is True when 'stat' is more than 'tolerance' (fractional) slower than the baseline,
+        and 'memory_regression' likewise for peak_bytes when both sides measured it.
+        """
+        if isinstance(baseline, str):
+            baseline = BenchmarkResult.load(baseline)
+        elif isinstance(baseline, dict):
+            baseline = BenchmarkResult.from_dict(baseline)
+
+        current, previous = getattr(self, stat), getattr(baseline, stat)
+        ratio = current / previous if previous else math.inf
+        report = {'stat': stat, 'current': current, 'baseline': previous, 'ratio': ratio,
+                  'regression': ratio > 1 + tolerance, 'memory_regression': False}
+
+        if self.peak_bytes is not None and baseline.peak_bytes:
+            report['memory_ratio'] = self.peak_bytes / baseline.peak_bytes
+            report['memory_regression'] = report['memory_ratio'] > 1 + tolerance
+        return report
+
+    def summary(self, lines: int = 10, precision: int = 6) -> str:
+        """Text report in the style of profile_run."""
+        header = '|' + f"  Benchmark:  \"{self.name}\"  " + '|'
+        out = ['~' * len(header), header, '~' * len(header), '']
+        out.append(f"   {len(self.times)} x {self.number} call(s)   min {self.min:.{precision}f}s"
+                   f"   median {self.median:.{precision}f}s   p95 {self.p95:.{precision}f}s")
+        if self.peak_bytes is not None:
+            out.append(f"   Peak Allocation: {self.peak_bytes / 1024**2:.{precision}f} MB")
+        if self.functions:
+            out.append('')
+            out.append(f"   {'ncalls':>10} {'tottime':>{precision + 6}} {'cumtime':>{precision + 6}}  function")
+            for f in self.functions[:lines]:
+                out.append(f"   {f['ncalls']:>10g} {f['tottime']:>{precision + 6}.{precision}f}"
+                           f" {f['cumtime']:>{precision + 6}.{precision}f}  {f['function']}")
+        return '\n'.join(out)
+
+    def __repr__(self) -> str:
+        return f"BenchmarkResult({self.name!r}, min={self.min:.3g}s, median={self.median:.3g}s, p95={self.p95:.3g}s)"
@@ -0,0 +1,117 @@
+import sys
+import time
+import threading
+from collections import OrderedDict
+from .misc import preserve_signature
+from ..typemacros.hashmacros import hashable_repr, hashable_digest
+
+
+
+def memoize(func = None, *, maxsize: int | None = 128, max_bytes: int | None = None, ttl: float | None = None,
+            key: str = 'repr', typed: bool = False):
+    """
+    functools.lru_cache for functions that take lists, dicts, sets and other unhashable arguments.
+    Usable bare (@memoize) or with options (@memoize(maxsize=None, ttl=60)).
+
+    Parameters:
+    - maxsize (int | None): Maximum number of cached results (None for no count limit).
+    - max_bytes (int | None): Approximate memory budget for cached results (recursive sys.getsizeof).
+    - ttl (float | None): Seconds a result stays valid.
+    - key (str): 'repr' keys on hashable_repr of the arguments; 'digest' on a 16 byte hashable_digest, which is
+      smaller to store and compare for large arguments.
+    - typed (bool): Cache arguments of different types separately (1 and 1.0 and True are equal otherwise).
+
+    Least recently used results are evicted past either limit.  The arguments of every cached call are kept alive
+    with its result, as lru_cache does, so identity-keyed objects (see hashable_repr) can't be confused with new
+    objects that reuse their id.  The wrapper gains cache_info() and cache_clear(), and is thread safe; concurrent
+    misses on the same key may each call the function.
+    """
+    if key not in ('repr', 'digest'):
+        raise ValueError(f"Unknown key type: {key!r}")
+    make_key = _digest_key if key == 'digest' else _repr_key
+
+    @preserve_signature
+    def decorator(func):
+        cache = OrderedDict()   #{key: (result, expires, nbytes, args, kwargs)}
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+        lock = threading.Lock()
+
+        def wrapper(*args, **kwargs):
+            k = make_key(args, kwargs, typed)
+            with lock:
+                entry = cache.get(k)
+                if entry is not None:
+                    if ttl is None or entry[1] > time.monotonic():
+                        cache.move_to_end(k)
+                        stats['hits'] += 1
+                        return entry[0]
+                    _evict(cache, stats, k)
+                stats['misses'] += 1
+
+            result = func(*args, **kwargs)
+            nbytes = _sizeof(result) if max_bytes is not None else 0
+            expires = time.monotonic() + ttl if ttl is not None else None
+
+            with lock:
+                if k in cache:
+                    _evict(cache, stats, k)
+                if max_bytes is None or nbytes <= max_bytes:
+                    cache[k] = (result, expires, nbytes, args, kwargs)
+                    stats['bytes'] += nbytes
+                    while (maxsize is not None and len(cache) > maxsize) or \
+                            (max_bytes is not None and stats['bytes'] > max_bytes):
+                        _evict(cache, stats, next(iter(cache)))
+                        stats['evictions'] += 1
+            return result
+
+        def cache_info() -> dict:
+            with lock:
+                return dict(stats, size=len(cache), maxsize=maxsize, max_bytes=max_bytes)
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+                stats.update(hits=0, misses=0, evictions=0, bytes=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def _repr_key(args: tuple, kwargs: dict, typed: bool):
+    key = (hashable_repr(args), hashable_repr(kwargs)) if kwargs else hashable_repr(args)
+    return (key, _types(args, kwargs)) if typed else key
+
+
+def _digest_key(args: tuple, kwargs: dict, typed: bool):
+    key = hashable_digest((args, kwargs))
+    return (key, _types(args, kwargs)) if typed else key
+
+
+def _types(args: tuple, kwargs: dict) -> tuple:
+    return tuple(type(a) for a in args) + tuple(type(v) for v in kwargs.values())
+
+
+def _evict(cache: OrderedDict, stats: dict, k) -> None:
+    stats['bytes'] -= cache.pop(k)[2]
+
+
+def _sizeof(obj) -> int:
+    """Approximate deep size of an object in bytes (containers are followed, shared objects counted once)."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
@@ -0,0 +1,241 @@
+import json
+import threading
+from time import perf_counter_ns
+from .misc import preserve_signature
+
+
+
+#Histograms
+#----------------------------------------------------------------------------------------------------------------------
+
+_SUB_BITS = 2                        #4 buckets per power of two: every bucket spans at most 25% of its value
+_MAX_BITS = 42                       #~73 minutes in ns; anything slower lands in the last bucket
+_BUCKETS = (_MAX_BITS - _SUB_BITS + 1) << _SUB_BITS
+
+def _bucket(ns: int) -> int:
+    """Log-linear bucket index of a duration in ns."""
+    bits = ns.bit_length()
+    if bits <= _SUB_BITS + 1:
+        return ns
+    if bits > _MAX_BITS:
+        return _BUCKETS - 1
+    return ((bits - _SUB_BITS) << _SUB_BITS) + ((ns >> (bits - _SUB_BITS - 1)) & ((1 << _SUB_BITS) - 1))
+
+def _bucket_bounds(index: int) -> tuple:
+    """[low, high) ns covered by a bucket."""
+    if index < 1 << (_SUB_BITS + 1):
+        return index, index + 1
+    shift = (index >> _SUB_BITS) + _SUB_BITS - 1 - _SUB_BITS
+    sub = (1 << _SUB_BITS) + (index & ((1 << _SUB_BITS) - 1))
+    return sub << shift, (sub + 1) << shift
+
+
+class Metric():
+    """Call count, error count and a fixed-size latency histogram for one instrumented function."""
+    __slots__ = ('name', 'calls', 'errors', 'timed', 'total_ns', 'min_ns', 'max_ns', 'buckets', '_lock')
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = self.errors = self.timed = self.total_ns = self.max_ns = 0
+        self.min_ns = None
+        self.buckets = [0] * _BUCKETS
+
+    def record(self, ns: int | None, error: bool = False) -> None:
+        """Counts one call, with its duration if it was timed."""
+        with self._lock:
+            self.calls += 1
+            if error:
+                self.errors += 1
+            if ns is not None:
+                self.timed += 1
+                self.total_ns += ns
+                self.buckets[_bucket(ns)] += 1
+                if ns > self.max_ns:
+                    self.max_ns = ns
+                if self.min_ns is None or ns < self.min_ns:
+                    self.min_ns = ns
+
+    def percentile(self, q: float) -> float | None:
+        """Approximate q-th percentile latency in seconds (within one bucket, <25% relative error)."""
+        if not self.timed:
+            return None
+        rank = q / 100 * self.timed
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                low, high = _bucket_bounds(index)
+                ns = min(max((low + high) / 2, self.min_ns), self.max_ns)
+                return ns / 1e9
+        return self.max_ns / 1e9
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'errors': self.errors,
+                'timed': self.timed,
+                'total_s': self.total_ns / 1e9,
+                'mean_s': self.total_ns / self.timed / 1e9 if self.timed else None,
+                'min_s': self.min_ns / 1e9 if self.min_ns is not None else None,
+                'p50_s': self.percentile(50),
+                'p90_s': self.percentile(90),
+                'p99_s': self.percentile(99),
+                'max_s': self.max_ns / 1e9 if self.timed else None,
+            }
+
+
+
+#Registry
+#----------------------------------------------------------------------------------------------------------------------
+
+class MetricsRegistry():
+    """
+    Process-wide collection of Metrics keyed by name.  While disabled, instrumented functions skip all
+    bookkeeping (a single attribute check per call).
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def metric(self, name: str) -> Metric:
+        """Returns the Metric for 'name', creating it on first use."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, Metric(name))
+        return metric
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Zeros every metric (instrumented functions keep reporting into them)."""
+        for metric in list(self._metrics.values()):
+            with metric._lock:
+                metric.reset()
+
+    def snapshot(self) -> dict:
+        """{name: stats dict} for every metric that has been called."""
+        return {name: metric.snapshot() for name, metric in sorted(self._metrics.items()) if metric.calls}
+
+    def to_json(self, path: str | None = None) -> str:
+        """Snapshot as json text; also written to 'path' if given."""
+        text = json.dumps(self.snapshot(), indent=2)
+        if path is not None:
+            with open(path, 'w') as file:
+                file.write(text)
+        return text
+
+    def report(self, sort_by: str = 'total_s', lines: int | None = None, precision: int = 4) -> str:
+        """
+        Text table of the snapshot, sorted descending by 'sort_by' (any snapshot key).
+        Each latency is shown in its own unit (ns, us, ms or s) with 'precision' significant digits, so
+        sub-microsecond functions stay readable next to slow ones.
+        """
+        rows = sorted(self.snapshot().items(), key=lambda item: item[1][sort_by] or 0, reverse=True)[:lines]
+        columns = ('calls', 'errors', 'total_s', 'mean_s', 'p50_s', 'p90_s', 'p99_s', 'max_s')
+        width = precision + 6
+
+        def cell(value):
+            if value is None:
+                return f"{'-':>{width}}"
+            return f"{value:>{width}}" if isinstance(value, int) else f"{_duration(value, precision):>{width}}"
+
+        out = [' '.join(f"{c.removesuffix('_s'):>{width}}" for c in columns) + '  name']
+        out += [' '.join(cell(stats[c]) for c in columns) + f"  {name}" for name, stats in rows]
+        return '\n'.join(out)
+
+
+def _duration(seconds: float, precision: int) -> str:
+    """Formats a duration in the smallest unit that keeps it below 1000 (e.g. '352ns', '20.44ms')."""
+    for unit, scale in (('ns', 1e9), ('us', 1e6), ('ms', 1e3)):
+        text = f"{seconds * scale:.{precision}g}"
+        if float(text) < 1000:
+            return text + unit
+    return f"{seconds:.{precision}g}s"
+
+
+metrics = MetricsRegistry()
+
+
+
+#Decorators
+#----------------------------------------------------------------------------------------------------------------------
+
+def timed(func = None, *, name: str | None = None, sample: int = 1, registry: MetricsRegistry | None = None):
+    """
+    Records call count, exceptions and latency of the decorated function in 'registry' (default: metrics).
+    Usable bare (@timed) or with options (@timed(name='union', sample=10)).
+
+    'sample=N' only times every Nth call (all calls are still counted), for functions too hot to time every call.
+    """
+    registry = registry or metrics
+
+    @preserve_signature
+    def decorator(func):
+        metric = registry.metric(name or _metric_name(func))
+        counter = [0]
+
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            if sample > 1:
+                counter[0] += 1
+                if counter[0] % sample:
+                    try:
+                        result = func(*args, **kwargs)
+                    except BaseException:
+                        metric.record(None, True)
+                        raise
+                    metric.record(None)
+                    return result
+
+            start = perf_counter_ns()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                metric.record(perf_counter_ns() - start, True)
+                raise
+            metric.record(perf_counter_ns() - start)
+            return result
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def counted(func = None, *, name: str | None = None, registry: MetricsRegistry | None = None):
+    """Like timed, but only records call and exception counts."""
+    registry = registry or metrics
+
+    @preserve_signature
+    def decorator(func):
+        metric = registry.metric(name or _metric_name(func))
+
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                metric.record(None, True)
+                raise
+            metric.record(None)
+            return result
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def _metric_name(func) -> str:
+    return f"{getattr(func, '__module__', None) or '?'}.{getattr(func, '__qualname__', repr(func))}"
@@ -5,6 +5,7 @@ import os
 from io import StringIO
 import inspect
 import functools
+from ..filemacros.filemacros import caller_frame
 
 
 
@@ -19,11 +20,8 @@ def profile_run(command: str, sort_by: str = 'cumtime', lines = None, precision
     - lines (int): Number of lines of stats to display.
     - precision (int): Number of decimal places to display for timing statistics.
     """
-    # Get the caller's frame
-    caller_frame = inspect.stack()[1]
-
     # Extract globals from the caller's frame (where the function is defined)
-    caller_globals = caller_frame[0].f_globals
+    caller_globals = caller_frame(1).f_globals
 
     #Track process
     process = psutil.Process(os.getpid())
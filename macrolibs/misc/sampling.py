@@ -0,0 +1,193 @@
+import sys
+import os
+import time
+import atexit
+import threading
+from collections import Counter
+import psutil
+
+
+
+class SamplingProfiler():
+    """
+    Statistical (wall-clock) profiler for long-running processes.
+
+    A daemon thread snapshots every other thread's stack via sys._current_frames() each 'interval' seconds and
+    counts identical stacks, so the profiled code runs untraced and the overhead is roughly proportional
+    to 1 / interval.  Process RSS is tracked alongside (as profile_run does).
+
+    Blocked threads (sleeping, waiting on I/O or locks) are sampled too, which is what wall-clock
+    profiling means; pass 'threads' (a collection of thread idents) to restrict sampling.
+    While other threads hold the GIL the sampler can only wake every sys.getswitchinterval() seconds,
+    so intervals below that are effectively rounded up.
+
+    with SamplingProfiler(interval=0.005) as sampler:
+        run_workload()
+    sampler.write_folded('profile.folded')   #flamegraph.pl / speedscope compatible
+    """
+    def __init__(self, interval: float = 0.005, max_depth: int = 128, threads = None, rss: bool = True):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.threads = threads
+        self.rss = rss
+        self.stacks = Counter()   #{(thread name, frame label, ...): samples}
+        self.samples = 0
+        self.rss_start = self.rss_peak = self.rss_end = None
+        self.started = self.stopped = None
+        self._labels = {}         #{code object: frame label}
+        self._names = {}          #{thread ident: thread name}
+        self._process = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()   #Guards stacks / samples against the sampler thread
+
+    #Control
+    #-----------------------------------------------
+
+    def start(self) -> 'SamplingProfiler':
+        if self._thread is not None:
+            raise RuntimeError("SamplingProfiler is already running")
+        self._process = psutil.Process(os.getpid()) if self.rss else None
+        if self._process:
+            self.rss_start = self.rss_peak = self._process.memory_info().rss
+        self.started, self.stopped = time.time(), None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='SamplingProfiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> 'SamplingProfiler':
+        if self._thread is None:
+            return self
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.stopped = time.time()
+        if self._process:
+            self.rss_end = self._process.memory_info().rss
+            self.rss_peak = max(self.rss_peak, self.rss_end)
+        return self
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def __enter__(self) -> 'SamplingProfiler':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+
+    #Sampling
+    #-----------------------------------------------
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self._sample(own)
+
+    def _sample(self, own: int) -> None:
+        frames = sys._current_frames()
+        stacks = []
+        for ident, frame in frames.items():
+            if ident == own or (self.threads is not None and ident not in self.threads):
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                label = self._labels.get(code)
+                if label is None:
+                    label = self._labels[code] = f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+                stack.append(label)
+                frame = frame.f_back
+            stack.append(self._thread_name(ident))
+            stacks.append(tuple(reversed(stack)))
+        del frames
+        with self._lock:
+            for stack in stacks:
+                self.stacks[stack] += 1
+            self.samples += 1
+
+        if self._process:
+            self.rss_peak = max(self.rss_peak, self._process.memory_info().rss)
+
+    def _thread_name(self, ident: int) -> str:
+        name = self._names.get(ident)
+        if name is None:
+            self._names = {t.ident: t.name for t in threading.enumerate()}
+            name = self._names.get(ident, f"Thread-{ident}")
+        return name
+
+    #Output
+    #-----------------------------------------------
+
+    def snapshot(self) -> Counter:
+        """Copy of the stack counts, consistent even while sampling is running."""
+        with self._lock:
+            return Counter(self.stacks)
+
+    def folded(self, per_thread: bool = True) -> str:
+        """Folded stacks ('root;...;leaf count' per line), with the thread name as root frame if 'per_thread'."""
+        counts = self.snapshot() if per_thread else self._merged()
+        return '\n'.join(';'.join(stack) + f" {count}" for stack, count in sorted(counts.items()))
+
+    def write_folded(self, path: str, per_thread: bool = True) -> None:
+        with open(path, 'w') as file:
+            file.write(self.folded(per_thread) + '\n')
+
+    def top(self, n: int = 10) -> list:
+        """[(frame label, samples)] for the frames most often on top of a stack (self time)."""
+        return self._top(self.snapshot(), n)
+
+    def summary(self, lines: int = 10) -> str:
+        """Text report in the style of profile_run."""
+        stacks = self.snapshot()
+        elapsed = (self.stopped or time.time()) - self.started if self.started else 0.0
+        header = '|' + f"  Sampling Profile:  {self.samples} samples over {elapsed:.2f}s  " + '|'
+        out = ['~' * len(header), header, '~' * len(header), '']
+        if self.rss_start is not None:
+            end = self.rss_end if self.rss_end is not None else self._process.memory_info().rss
+            out.append(f"   RSS: {self.rss_start / 1024**2:.1f} MB -> {end / 1024**2:.1f} MB"
+                       f" (peak {self.rss_peak / 1024**2:.1f} MB)\n")
+        total = sum(stacks.values()) or 1
+        for label, count in self._top(stacks, lines):
+            out.append(f"   {count:>8}  {100 * count / total:5.1f}%  {label}")
+        return '\n'.join(out)
+
+    def _merged(self) -> Counter:
+        merged = Counter()
+        for stack, count in self.snapshot().items():
+            merged[stack[1:]] += count
+        return merged
+
+    @staticmethod
+    def _top(stacks: Counter, n: int) -> list:
+        leaves = Counter()
+        for stack, count in stacks.items():
+            leaves[stack[-1]] += count
+        return leaves.most_common(n)
+
+
+
+#Process-Lifetime Sampling
+#----------------------------------------------------------------------------------------------------------------------
+
+def attach_sampler(path: str | None = None, interval: float = 0.01, **kwargs) -> SamplingProfiler:
+    """
+    Starts a SamplingProfiler for the rest of the process lifetime.
+    At exit it is stopped and, if 'path' is given, its folded stacks are written there.
+    """
+    sampler = SamplingProfiler(interval, **kwargs).start()
+
+    def detach():
+        sampler.stop()
+        if path is not None:
+            sampler.write_folded(path)
+
+    atexit.register(detach)
+    return sampler
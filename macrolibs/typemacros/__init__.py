@@ -1,2 +1,3 @@
 from .typemacros import *
-from .searchmacros import *
\ No newline at end of file
+from .searchmacros import *
+from .indexmacros import *
@@ -0,0 +1,103 @@
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import compress, islice
+from pickle import dumps, PicklingError
+from .hashmacros import hashable_digest, IdentityKeyError
+
+
+def _digest_chunk(chunk: list, compare_as, size: int) -> list:
+    """Worker: digests of one pickled chunk of items."""
+    return [hashable_digest(compare_as(x), size, strict=True) for x in chunk]
+
+
+_SHARED = None   #(A, B, compare_as, size) in forked workers
+
+def _share(shared: tuple) -> None:
+    global _SHARED
+    _SHARED = shared
+
+
+def _digest_range(which: int, start: int, stop: int) -> list:
+    """Worker: digests of A[start:stop] (which=0) or B[start:stop] (which=1), read from the forked memory image."""
+    seq, compare_as, size = _SHARED[which], _SHARED[2], _SHARED[3]
+    return [hashable_digest(compare_as(seq[i]), size) for i in range(start, stop)]
+
+
+def _fork_context():
+    """A 'fork' multiprocessing context where it is available and safe, else None."""
+    if sys.platform == 'darwin' or 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context('fork')
+
+
+def _results(futures: list):
+    for future in futures:
+        yield from future.result()
+
+
+def parallel_filter(A, B, compare_as, size: int, workers: int, keep: bool, chunksize: int | None = None) -> list | None:
+    """
+    Returns the items of 'A' whose key is (keep=True) or is not (keep=False) a key of 'B'.
+
+    Key generation ('compare_as' plus 'hashable_digest') is the CPU bound part, so both inputs are split into
+    index ranges that are digested across a process pool.  Where 'fork' is available the workers read the items
+    straight from the inherited memory image, so only (start, stop) goes out and fixed-size digests come back.
+    Elsewhere the items are pickled to the workers in chunks ('compare_as' must then be picklable).
+    The membership test itself runs in the parent on a plain set of bytes, and the results keep the order of 'A'.
+
+    Pickled copies have new ids, so on that path inputs holding identity-keyed objects (see hashable_digest)
+    cannot be digested in the workers.  None is returned in that case and the caller uses the serial path.
+    """
+    A = A if isinstance(A, list | tuple) else list(A)
+    B = B if isinstance(B, list | tuple) else list(B)
+    if chunksize is None:
+        chunksize = max(1, min(65536, (len(A) + len(B)) // (workers * 8)))
+
+    context = _fork_context()
+    if context is None:
+        try:
+            dumps(compare_as)
+        except (PicklingError, TypeError, AttributeError):
+            raise TypeError("'compare_as' must be picklable (defined at module level) to use workers")
+        executor = ProcessPoolExecutor(max_workers=workers)
+        submit = lambda which, seq, i: executor.submit(_digest_chunk, seq[i:i + chunksize], compare_as, size)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                       initializer=_share, initargs=((A, B, compare_as, size),))
+        submit = lambda which, seq, i: executor.submit(_digest_range, which, i, min(i + chunksize, len(seq)))
+
+    try:
+        # Submit A before consuming B so both inputs are digested concurrently
+        futures_B = [submit(1, B, i) for i in range(0, len(B), chunksize)]
+        futures_A = [submit(0, A, i) for i in range(0, len(A), chunksize)]
+        seen = set(_results(futures_B))
+        digests_A = _results(futures_A)
+        if keep:
+            return list(compress(A, (d in seen for d in digests_A)))
+        return list(compress(A, (d not in seen for d in digests_A)))
+    except IdentityKeyError:
+        return None
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def imap_chunks(executor, fn, items, chunksize: int, max_pending: int):
+    """
+    Submits fn(chunk) for consecutive chunks of the iterable 'items' and yields the results item by item in order.
+    At most 'max_pending' chunks are in flight, so 'items' is consumed lazily.
+    """
+    items = iter(items)
+    pending = deque()
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) < max_pending:
+            chunk = list(islice(items, chunksize))
+            if chunk:
+                pending.append(executor.submit(fn, chunk))
+            else:
+                exhausted = True
+        if not pending:
+            return
+        yield from pending.popleft().result()
@@ -1,93 +1,215 @@
 from typing import Any, TypeVar
+from collections.abc import Mapping
+import inspect
 from .typemacros import tupler, maybe_arg
+from .hashmacros import hashable_repr
 
 
 #Custom token to break a search in a callback.
 BREAK_SEARCH = object()
 
+#Returned by a matcher for nodes that are not replaced.
+_MISS = object()
+
 Iterables = TypeVar('Iterables', list, tuple, dict, set)
 
-def _replace_value_mutable(a: Iterables, old_vals: tuple | Any, new_val,callback = None) -> Iterables:
-    no_callback = callback is None
-    callback = callback if callback is not None else lambda old, new, parents: new
-    old_vals = tupler(old_vals)
 
-    stack = [(a, [])]  # (current structure, parents)
+def _compile_matcher(old_vals: tuple | Any, new_val, replace_map = None):
+    """
+    Returns match(node) -> replacement value, or _MISS.
+
+    Every value in 'old_vals' maps to 'new_val', and 'replace_map' (a dict or iterable of (old, new) pairs) adds
+    its own pairs.  Hashable old values are found with one dict lookup per node.  Unhashable list, tuple, dict and
+    set old values are keyed by 'hashable_repr', and any other unhashable old values are compared one by one.
+    """
+    pairs = [(old, new_val) for old in tupler(old_vals)]
+    if replace_map is not None:
+        pairs.extend(replace_map.items() if isinstance(replace_map, Mapping) else replace_map)
+
+    direct, by_repr, linear = {}, {}, []
+    for old, new in pairs:
+        try:
+            direct.setdefault(old, new)
+        except TypeError:
+            if isinstance(old, (list, tuple, dict, set)):
+                by_repr.setdefault(hashable_repr(old), new)
+            else:
+                linear.append((old, new))
+
+    get = direct.get
+    unhashable = {}   #{type: True if instances can't be dict keys}
+
+    def lookup(node):
+        cls = type(node)
+        skip = unhashable.get(cls)
+        if skip is None:
+            skip = unhashable[cls] = cls.__hash__ is None
+        if skip:
+            return _MISS
+        try:
+            return get(node, _MISS)
+        except TypeError:
+            #Hashable container holding unhashable items, e.g. a tuple of lists
+            return _MISS
+
+    if not by_repr and not linear:
+        return lookup
+
+    def match(node):
+        value = lookup(node)
+        if value is _MISS:
+            if by_repr and isinstance(node, (list, tuple, dict, set)):
+                value = by_repr.get(hashable_repr(node), _MISS)
+            if value is _MISS:
+                for old, new in linear:
+                    if node == old:
+                        return new
+        return value
+    return match
+
+def _wants_parents(callback) -> bool:
+    """True if 'callback' can receive the 'parents' keyword."""
+    try:
+        params = inspect.signature(callback).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    return any(par.name == 'parents' or par.kind is par.VAR_KEYWORD for par in params)
+
+
+def _compile_callback(callback = None) -> tuple:
+    """Returns (adapted callback, wants_parents).  The user callback is wrapped with maybe_arg once per search."""
+    # (Optimization) Skip maybe_arg for default callback
+    if callback is None:
+        return (lambda old, new, parents: new), False
+    return maybe_arg(callback), _wants_parents(callback)
+
+
+def _unlink(chain) -> list:
+    """Builds the 'parents' list (immediate parent first) from a linked parent chain."""
+    parents = []
+    while chain is not None:
+        container, chain = chain
+        parents.append(container)
+    return parents
+
+
+def _replace_value_mutable(a: Iterables, match, callback, wants_parents: bool) -> Iterables:
+    # (current structure, key in its parent, parent chain)
+    # The chain is a linked list (parent, grandparent chain) shared by all siblings, so each push is O(1)
+    stack = [(a, None, None)]
 
     # Process the stack iteratively
     while stack:
         #Remove from stack
-        current, parents = stack.pop()
+        current, key, chain = stack.pop()
 
         #Replace the current element
-        if current in old_vals:
-            # (Optimization) Skip maybe_arg for default callback 
-            m_callback = callback if no_callback else maybe_arg(callback)
-            new_value = m_callback(current, new_val, parents = parents)
+        new_val = match(current)
+        if new_val is not _MISS:
+            #Only build the parents list if the callback can use it
+            parents = _unlink(chain) if wants_parents else None
+            new_value = callback(current, new_val, parents = parents)
 
             #Break on token
             if new_value is BREAK_SEARCH:
                 return a
-            
-            if parents:
-                #Get first parent from list
-                parent = parents[0]
-
-                #Update the parent structure with the new value
-                if isinstance(parent, list):
-                    parent[parent.index(current)] = new_value
-                elif isinstance(parent, dict):
-                    for k, v in parent.items():
-                        if v == current:
-                            parent[k] = new_value
-                elif isinstance(parent, set):
+
+            if chain is not None:
+                parent = chain[0]
+
+                #Update the known slot of the parent structure with the new value
+                if isinstance(parent, set):
                     parent.remove(current)
                     parent.add(new_value)
+                else:
+                    parent[key] = new_value
             continue
 
-        #Append Stack for each item in the iterable and join parents list
+        #Append Stack for each item in the iterable and link it to its parent
         if isinstance(current, list):
-            stack.extend((item, [current] + parents) for item in current)
+            link = (current, chain)
+            stack.extend((item, i, link) for i, item in enumerate(current))
         elif isinstance(current, set):
-            stack.extend((item, [current] + parents) for item in current)
+            link = (current, chain)
+            stack.extend((item, None, link) for item in current)
         elif isinstance(current, dict):
-            stack.extend((v, [current] + parents) for v in current.values())
+            link = (current, chain)
+            stack.extend((v, k, link) for k, v in current.items())
 
     return a
 
 
-#The stack based approach is 50% faster and handles deeper recursion, but does not work with tuples.
-class _replace_value_recursive():
-    def __init__(self):
-        self.broken = False
-
-    def __call__(self, a: Iterables, old_vals: tuple | Any, new_val, callback=None, parents=None) -> Iterables:
-        #More memory efficient to break early
-        if self.broken:
-            return a
-        
-        parents = [] if parents is None else parents # Fix mutable default argument
-        initial_callback = callback
-        callback = callback if callback is not None else lambda old, new, parents: new
-        old_vals = tupler(old_vals)
-
-        if a in old_vals:
-            # (Optimization) Skip maybe_arg for default callback 
-            m_callback = callback if initial_callback is None else maybe_arg(callback)
-            new_value = m_callback(a, new_val, parents = parents)
-            if new_value is BREAK_SEARCH:
-                self.broken = True
-                return a
-            else:
-                return new_value
-
-        elif isinstance(a, list):
-            return type(a)(self(x, old_vals, new_val, initial_callback, [a] + parents) for x in a)
-        elif isinstance(a, tuple):
-            return type(a)(self(x, old_vals, new_val, initial_callback, [a] + parents) for x in a)
-        elif isinstance(a, dict):
-            return type(a)({k: self(v, old_vals, new_val, initial_callback, [a] + parents) for k, v in a.items()})
-        elif isinstance(a, set):
-            return type(a)(self(x, old_vals, new_val, initial_callback, [a] + parents) for x in a)
-        else:
-            return a
\ No newline at end of file
+def _rebuild(container, changes: dict):
+    """Copies 'container' with the changed slots (index, key, or set member) replaced."""
+    if isinstance(container, set):
+        return type(container)(changes[x] if x in changes else x for x in container)
+    if isinstance(container, dict):
+        new = dict(container)
+    else:
+        new = list(container)
+    for key, value in changes.items():
+        new[key] = value
+    return new if type(new) is type(container) else type(container)(new)
+
+
+def _children(container):
+    """Iterator of (slot, child) pairs."""
+    if isinstance(container, dict):
+        return iter(container.items())
+    if isinstance(container, set):
+        return ((x, x) for x in container)
+    return enumerate(container)
+
+
+def _replace_value_return(a: Iterables, match, callback, wants_parents: bool) -> Iterables:
+    """
+    Non-destructive, iterative find and replace with structural sharing.  Containers are only copied if something
+    below them was replaced; every untouched subtree is returned by reference.
+    """
+    new_val = match(a)
+    if new_val is not _MISS:
+        new_value = callback(a, new_val, parents = [] if wants_parents else None)
+        return a if new_value is BREAK_SEARCH else new_value
+    if not isinstance(a, (list, tuple, dict, set)):
+        return a
+
+    # [container, children iterator, changes by slot (None until a hit), parent chain, slot in parent]
+    stack = [[a, _children(a), None, None, None]]
+    broken = False
+    result = a
+
+    while stack:
+        frame = stack[-1]
+        container, children, changes, chain = frame[:4]
+
+        if not broken:
+            step = next(children, None)
+            if step is not None:
+                slot, child = step
+                new_val = match(child)
+                if new_val is not _MISS:
+                    #Only build the parents list if the callback can use it
+                    parents = _unlink((container, chain)) if wants_parents else None
+                    new_value = callback(child, new_val, parents = parents)
+                    if new_value is BREAK_SEARCH:
+                        broken = True
+                    else:
+                        if changes is None:
+                            changes = frame[2] = {}
+                        changes[slot] = new_value
+                elif isinstance(child, (list, tuple, dict, set)) and child:
+                    stack.append([child, _children(child), None, (container, chain), slot])
+                continue
+
+        #Container finished (or search broken): copy it only if something changed below it
+        stack.pop()
+        built = _rebuild(container, changes) if changes else container
+        if not stack:
+            result = built
+        elif built is not container:
+            parent = stack[-1]
+            if parent[2] is None:
+                parent[2] = {}
+            parent[2][frame[4]] = built
+
+    return result
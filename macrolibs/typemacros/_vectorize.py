@@ -0,0 +1,106 @@
+from itertools import chain, compress, repeat
+from operator import is_not
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+#Below this many items the type scan and array conversion cost more than they save (see benchmarks/bench_vectorize.py)
+VECTORIZE_THRESHOLD = 256
+#Unicode arrays are slower than the generic path at every size, so str inputs are only vectorized when forced
+AUTO_KINDS = ('i', 'f')
+
+_KINDS = {int: 'i', float: 'f', str: 'U'}
+_DTYPE_KINDS = {'i': 'i', 'u': 'i', 'f': 'f', 'U': 'U'}
+
+
+def _as_array(seq, kind: str | None, force: bool):
+    """
+    Returns (array, kind) for a non-empty flat homogeneous int, float or str sequence, or (None, None).
+    The kind comes from the first item's type, so sequences of other kinds are never scanned or converted.
+    """
+    if isinstance(seq, np.ndarray):
+        if seq.ndim != 1:
+            return None, None
+        arr_kind = _DTYPE_KINDS.get(seq.dtype.kind)
+    else:
+        t = type(seq[0])
+        arr_kind = _KINDS.get(t)
+    if arr_kind is None or (kind is not None and arr_kind != kind) or (not force and arr_kind not in AUTO_KINDS):
+        return None, None
+
+    if isinstance(seq, np.ndarray):
+        arr = seq
+    else:
+        #Stops at the first item of another type
+        if any(map(is_not, repeat(t), map(type, seq))):
+            return None, None
+        # numpy strips trailing null characters from str items
+        if t is str and any('\x00' in item for item in seq):
+            return None, None
+        try:
+            arr = np.asarray(seq)
+        except OverflowError:
+            return None, None
+        # ints beyond 64 bits become object arrays
+        if _DTYPE_KINDS.get(arr.dtype.kind) != arr_kind:
+            return None, None
+
+    # Python sets never merge distinct nan objects; np.unique does
+    if arr_kind == 'f' and np.isnan(arr).any():
+        return None, None
+    return arr, arr_kind
+
+
+def _as_arrays(sequences, force: bool) -> list | None:
+    """Converts every sequence to an array of one shared kind, or returns None to fall back."""
+    if np is None or not all(isinstance(seq, (list, tuple, np.ndarray)) for seq in sequences):
+        return None
+    if not force and sum(map(len, sequences)) < VECTORIZE_THRESHOLD:
+        return None
+    arrays, kind = [], None
+    for seq in sequences:
+        if len(seq) == 0:
+            arrays.append(None)
+            continue
+        arr, kind = _as_array(seq, kind, force)
+        if arr is None:
+            return None
+        arrays.append(arr)
+    if kind is None:
+        return None
+    # concatenate/isin promote to a common dtype; uint64 mixed with a signed int becomes float64 and loses precision
+    dtype = np.result_type(*(arr.dtype for arr in arrays if arr is not None))
+    if kind == 'i' and dtype.kind == 'f':
+        return None
+    return [np.empty(0, dtype=dtype) if arr is None else arr for arr in arrays]
+
+
+def vector_union(sequences: list, force: bool = False) -> list | None:
+    """Order preserving union of flat homogeneous sequences, or None if the generic path must be used."""
+    arrays = _as_arrays(sequences, force)
+    if arrays is None:
+        return None
+    flat = np.concatenate(arrays)
+    _, first = np.unique(flat, return_index=True)
+    mask = np.zeros(len(flat), dtype=bool)
+    mask[first] = True
+    return list(compress(chain.from_iterable(sequences), mask))
+
+
+def vector_compliment(A, B, force: bool = False) -> list | None:
+    """Order preserving compliment of flat homogeneous sequences, or None if the generic path must be used."""
+    arrays = _as_arrays((A, B), force)
+    if arrays is None:
+        return None
+    return list(compress(A, np.isin(arrays[0], arrays[1], invert=True)))
+
+
+def vector_intersect(A, B, force: bool = False) -> list | None:
+    """Order preserving intersection of flat homogeneous sequences, or None if the generic path must be used."""
+    arrays = _as_arrays((A, B), force)
+    if arrays is None:
+        return None
+    return list(compress(A, np.isin(arrays[0], arrays[1])))
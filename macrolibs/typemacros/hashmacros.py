@@ -1,5 +1,8 @@
 from pickle import dumps, PicklingError
 from types import MethodType
+from hashlib import blake2b
+import os, sqlite3, tempfile, struct
+from math import ceil, exp, log
 
 
 def hashable_repr(obj):
@@ -28,4 +31,286 @@ def hashable_repr(obj):
         except (PicklingError, TypeError):
             # If it's not pickleable (e.g., a lambda, local function, etc.),
             # fall back to a representation using its id.
-            return ('__id__', id(obj))
\ No newline at end of file
+            return ('__id__', id(obj))
+
+
+#Digests
+#----------------------------------------------------------------------------------------------------------------------
+
+DIGEST_SIZE = 16
+
+class IdentityKeyError(TypeError):
+    """Raised by hashable_digest(strict=True) for objects that could only be keyed by id()."""
+
+
+def hashable_digest(obj, size: int = DIGEST_SIZE, strict: bool = False) -> bytes:
+    """
+    Create a fixed-size structural fingerprint of any object.
+
+    Two objects receive the same digest whenever their 'hashable_repr' compare equal, but the nested tuple
+    mirror is never built; the structure is streamed straight into a blake2b hash instead.  Distinct
+    objects may collide with a probability of about 2**(-8 * size) per pair.
+
+    Objects with a __dict__, methods and unpicklable objects are keyed by id(), which is only meaningful inside
+    the process that owns them; 'strict=True' raises IdentityKeyError for them instead.
+    """
+    h = blake2b(digest_size=size)
+    _feed_digest(h, obj, size, strict)
+    return h.digest()
+
+
+def _feed_digest(h, obj, size: int, strict: bool = False) -> None:
+    """Streams a tagged, length-prefixed encoding of 'obj' into the hash 'h'."""
+    if isinstance(obj, str):
+        data = obj.encode('utf-8', 'surrogatepass')
+        h.update(b's%d:' % len(data))
+        h.update(data)
+    elif isinstance(obj, (int, float)):
+        # Mirror hashable_repr equality: True == 1 == 1.0
+        if isinstance(obj, float) and not obj.is_integer():
+            h.update(b'f%s;' % repr(float(obj)).encode())
+        else:
+            h.update(b'i%d;' % int(obj))
+    elif obj is None:
+        h.update(b'n;')
+    elif isinstance(obj, bytes):
+        h.update(b'b%d:' % len(obj))
+        h.update(obj)
+    elif isinstance(obj, list):
+        h.update(b'l%d[' % len(obj))
+        for i in obj:
+            _feed_digest(h, i, size, strict)
+    elif isinstance(obj, tuple):
+        h.update(b't%d(' % len(obj))
+        for i in obj:
+            _feed_digest(h, i, size, strict)
+    elif isinstance(obj, dict):
+        # Unordered: digest each item on its own and feed them sorted
+        h.update(b'd%d{' % len(obj))
+        for d in sorted(hashable_digest((k, v), size, strict) for k, v in obj.items()):
+            h.update(d)
+    elif isinstance(obj, set):
+        h.update(b'e%d{' % len(obj))
+        for d in sorted(hashable_digest(i, size, strict) for i in obj):
+            h.update(d)
+    elif isinstance(obj, MethodType) or hasattr(obj, '__dict__'):
+        if strict:
+            raise IdentityKeyError(f"{type(obj).__name__} objects are keyed by id()")
+        h.update(b'o%s:%d;' % (str(type(obj)).encode(), id(obj)))
+    else:
+        try:
+            data = dumps(obj)
+            h.update(b'p%d:' % len(data))
+            h.update(data)
+        except (PicklingError, TypeError):
+            if strict:
+                raise IdentityKeyError(f"{type(obj).__name__} objects are keyed by id()")
+            h.update(b'#%d;' % id(obj))
+
+
+class DigestSet():
+    """
+    DigestSet(size: int = 16, verify: bool = False)
+
+    A set-like container that stores a fixed-size 'hashable_digest' per member instead of the member itself.
+    Memory scales with the number of members, not their size.
+
+    Collision policy:
+        - verify=False (default): a digest hit is reported as a match.  False matches happen with a probability
+          of about n**2 / 2**(8 * size + 1) for n members, which is negligible at the default 16 bytes.
+        - verify=True: a reference to each member is kept alongside its digest and a hit is confirmed by comparing
+          'hashable_repr' of both objects.  Exact, but members are kept alive by the set.
+    """
+    def __init__(self, size: int = DIGEST_SIZE, verify: bool = False):
+        self.size = size
+        self.verify = verify
+        self._digests = {} if verify else set()
+
+    def add(self, obj) -> None:
+        d = hashable_digest(obj, self.size)
+        if not self.verify:
+            self._digests.add(d)
+        else:
+            bucket = self._digests.setdefault(d, [])
+            if not bucket or not self._verified(bucket, obj):
+                bucket.append(obj)
+
+    def update(self, objs) -> None:
+        for obj in objs:
+            self.add(obj)
+
+    def __contains__(self, obj) -> bool:
+        d = hashable_digest(obj, self.size)
+        if not self.verify:
+            return d in self._digests
+        bucket = self._digests.get(d)
+        return bucket is not None and self._verified(bucket, obj)
+
+    def __len__(self) -> int:
+        return len(self._digests) if not self.verify else sum(map(len, self._digests.values()))
+
+    @staticmethod
+    def _verified(bucket: list, obj) -> bool:
+        key = hashable_repr(obj)
+        return any(hashable_repr(o) == key for o in bucket)
+
+
+class SpillSet():
+    """
+    SpillSet(max_keys: int, spill_dir: str | None = None)
+
+    A set of bytes keys (e.g. 'hashable_digest' fingerprints) with bounded memory.  Keys are held in memory until
+    there are more than 'max_keys' of them, then they are moved to an on-disk sqlite index in 'spill_dir'
+    (the system temp directory by default).  The index file is removed on close().
+    """
+    def __init__(self, max_keys: int, spill_dir: str | None = None):
+        self.max_keys = max_keys
+        self.spill_dir = spill_dir
+        self._memory = set()
+        self._db = None
+        self._path = None
+        self._spilled = 0
+
+    def add(self, key: bytes) -> None:
+        self._memory.add(key)
+        if len(self._memory) > self.max_keys:
+            self._spill()
+
+    def update(self, keys) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: bytes) -> bool:
+        if key in self._memory:
+            return True
+        if self._db is None:
+            return False
+        return self._db.execute("SELECT 1 FROM seen WHERE k = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return len(self._memory) + self._spilled
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _spill(self) -> None:
+        if self._db is None:
+            fd, self._path = tempfile.mkstemp(suffix='.sqlite', prefix='spillset_', dir=self.spill_dir)
+            os.close(fd)
+            self._db = sqlite3.connect(self._path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode = OFF")
+            self._db.execute("PRAGMA synchronous = OFF")
+            self._db.execute("CREATE TABLE seen (k BLOB PRIMARY KEY) WITHOUT ROWID")
+        cursor = self._db.executemany("INSERT OR IGNORE INTO seen VALUES (?)", ((k,) for k in self._memory))
+        self._spilled += cursor.rowcount
+        self._db.commit()
+        self._memory.clear()
+
+    def close(self) -> None:
+        """Drops the on-disk index."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            os.remove(self._path)
+        self._memory.clear()
+        self._spilled = 0
+
+
+class BloomFilter():
+    """
+    BloomFilter(capacity: int, error_rate: float = 0.01)
+
+    A compact probabilistic set of any objects, keyed on their 'hashable_digest'.  Membership tests never give
+    false negatives and give false positives at roughly 'error_rate' once 'capacity' members have been added
+    (more if it is overfilled).  Members themselves are not stored, only k bits each in a bit array of
+    about -capacity * ln(error_rate) / ln(2)**2 bits.
+    """
+    _MAGIC = b'MLBF1'
+    _HEADER = struct.Struct('<5sQQQd')
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if not 0 < error_rate < 1:
+            raise ValueError("'error_rate' must be between 0 and 1")
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, ceil(-capacity * log(error_rate) / log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    @classmethod
+    def build(cls, items, error_rate: float = 0.01, compare_as = None) -> 'BloomFilter':
+        """Builds a filter sized for 'items' (a list or tuple), optionally keyed through 'compare_as'."""
+        bloom = cls(len(items), error_rate)
+        bloom.update(items if compare_as is None else map(compare_as, items))
+        return bloom
+
+    def _positions(self, obj):
+        # Double hashing: two 64 bit halves of one digest give all k positions
+        d = hashable_digest(obj, 16)
+        h1 = int.from_bytes(d[:8], 'little')
+        h2 = int.from_bytes(d[8:], 'little') | 1
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+    def add(self, obj) -> None:
+        bits = self._bits
+        for pos in self._positions(obj):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, objs) -> None:
+        for obj in objs:
+            self.add(obj)
+
+    def __contains__(self, obj) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(obj))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+    @property
+    def fill_ratio(self) -> float:
+        """Fraction of bits set."""
+        return int.from_bytes(self._bits, 'little').bit_count() / self.num_bits
+
+    @property
+    def observed_error_rate(self) -> float:
+        """False positive rate estimated from the bits actually set."""
+        return self.fill_ratio ** self.num_hashes
+
+    def expected_error_rate(self) -> float:
+        """False positive rate predicted for the number of members added."""
+        return (1 - exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def save(self, path: str) -> None:
+        """Saves the filter to a binary file."""
+        with open(path, 'wb') as file:
+            file.write(self._HEADER.pack(self._MAGIC, self.capacity, self.num_hashes, self.count, self.error_rate))
+            file.write(self._bits)
+
+    @classmethod
+    def load(cls, path: str) -> 'BloomFilter':
+        """Loads a filter saved with save()."""
+        with open(path, 'rb') as file:
+            header = file.read(cls._HEADER.size)
+            bits = file.read()
+        magic, capacity, num_hashes, count, error_rate = cls._HEADER.unpack(header)
+        if magic != cls._MAGIC:
+            raise ValueError(f"{path} is not a saved BloomFilter")
+        bloom = cls(capacity, error_rate)
+        if len(bits) != len(bloom._bits) or num_hashes != bloom.num_hashes:
+            raise ValueError(f"{path} is corrupted")
+        bloom._bits = bytearray(bits)
+        bloom.count = count
+        return bloom
@@ -0,0 +1,228 @@
+from typing import Any
+from .hashmacros import hashable_repr
+from .typemacros import tupler, maybe_arg
+from ._replace_value import BREAK_SEARCH
+
+
+_CONTAINERS = (list, dict, set)
+
+
+class ValueIndex():
+    """
+    ValueIndex(a: list | dict | set)
+
+    Persistent index of the values nested in a list/dict/set structure, keyed by 'hashable_repr'.  Each value maps
+    to its (container, slot) locations, where the slot is a list index, a dict key, or the member itself for sets.
+    Lookups and replacements cost O(hits) instead of a full traversal.
+
+    Lists, dicts and sets are the structure and are not indexed as values themselves; everything else (including
+    tuples) is.  Writes made through the index (set, replace, append, add, delete) keep it consistent without a
+    rebuild.  Writes made around it are not seen; call rebuild() after them.  Self-referencing containers that a
+    write detaches stay indexed until prune().
+    """
+    def __init__(self, a: list | dict | set):
+        if not isinstance(a, _CONTAINERS):
+            raise TypeError("ValueIndex needs a list, dict or set")
+        self.root = a
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Re-indexes the whole structure."""
+        self._locations = {}    # key -> {(id(container), slot): (container, slot)}
+        self._slot_keys = {}    # (id(container), slot) -> key
+        self._containers = {}   # id(container) -> [container, reference count]
+        self._index(self.root)
+
+    #Index maintenance
+    #-----------------------------------------------------------------------------------------------------------------
+
+    def _index(self, value) -> None:
+        """Indexes 'value' (a container reached from one more slot) and everything below it."""
+        stack = [value]
+        while stack:
+            container = stack.pop()
+            entry = self._containers.get(id(container))
+            if entry is not None:
+                #Shared (or cyclic) container: already indexed
+                entry[1] += 1
+                continue
+            self._containers[id(container)] = [container, 1]
+            for slot, child in _slots(container):
+                if isinstance(child, _CONTAINERS):
+                    stack.append(child)
+                else:
+                    self._add(container, slot, child)
+
+    def _unindex(self, value) -> None:
+        """Drops one reference to the container 'value' and unindexes it once nothing else reaches it."""
+        stack = [value]
+        while stack:
+            container = stack.pop()
+            entry = self._containers.get(id(container))
+            if entry is None:
+                continue
+            entry[1] -= 1
+            if entry[1] > 0:
+                continue
+            del self._containers[id(container)]
+            for slot, child in _slots(container):
+                if isinstance(child, _CONTAINERS):
+                    stack.append(child)
+                else:
+                    self._remove(container, slot)
+
+    def _add(self, container, slot, value) -> None:
+        key = hashable_repr(value)
+        self._locations.setdefault(key, {})[(id(container), slot)] = (container, slot)
+        self._slot_keys[(id(container), slot)] = key
+
+    def _remove(self, container, slot) -> None:
+        key = self._slot_keys.pop((id(container), slot), None)
+        if key is None:
+            return
+        locations = self._locations[key]
+        del locations[(id(container), slot)]
+        if not locations:
+            del self._locations[key]
+
+    def _detach(self, container, slot, value) -> None:
+        if isinstance(value, _CONTAINERS):
+            self._unindex(value)
+        else:
+            self._remove(container, slot)
+
+    def _attach(self, container, slot, value) -> None:
+        if isinstance(value, _CONTAINERS):
+            self._index(value)
+        else:
+            self._add(container, slot, value)
+
+    def _check(self, container) -> None:
+        if id(container) not in self._containers:
+            raise ValueError("container is not part of the indexed structure")
+
+    #Queries
+    #-----------------------------------------------------------------------------------------------------------------
+
+    def find(self, value) -> list[tuple]:
+        """Returns the (container, slot) locations of 'value'."""
+        return list(self._locations.get(hashable_repr(value), {}).values())
+
+    def count(self, value) -> int:
+        return len(self._locations.get(hashable_repr(value), ()))
+
+    def __contains__(self, value) -> bool:
+        return hashable_repr(value) in self._locations
+
+    def __len__(self) -> int:
+        """Number of indexed value locations."""
+        return len(self._slot_keys)
+
+    #Writes
+    #-----------------------------------------------------------------------------------------------------------------
+
+    def set(self, container, slot, value) -> None:
+        """
+        Writes container[slot] = value (for sets, replaces the member 'slot' with 'value').
+        New dict keys are inserted; negative list indices are normalized.
+        """
+        self._check(container)
+        if isinstance(container, set):
+            self._detach(container, slot, slot)
+            container.remove(slot)
+            container.add(value)
+            self._attach(container, value, value)
+            return
+        if isinstance(container, list):
+            slot = range(len(container))[slot]
+        elif slot not in container:
+            container[slot] = value
+            self._attach(container, slot, value)
+            return
+        self._detach(container, slot, container[slot])
+        container[slot] = value
+        self._attach(container, slot, value)
+
+    def replace(self, old_vals: tuple | Any, new_val, callback = None) -> int:
+        """
+        Replaces every indexed occurrence of 'old_vals' with 'new_val' in O(hits) and returns the number replaced.
+        'callback' works as in replace_value_nested (without 'parents'), including BREAK_SEARCH.
+        """
+        callback = maybe_arg(callback) if callback is not None else lambda old, new: new
+        replaced = 0
+        for old in tupler(old_vals):
+            for container, slot in self.find(old):
+                current = slot if isinstance(container, set) else container[slot]
+                new_value = callback(current, new_val)
+                if new_value is BREAK_SEARCH:
+                    return replaced
+                self.set(container, slot, new_value)
+                replaced += 1
+        return replaced
+
+    def append(self, container: list, value) -> None:
+        self._check(container)
+        container.append(value)
+        self._attach(container, len(container) - 1, value)
+
+    def add(self, container: set, value) -> None:
+        self._check(container)
+        if value not in container:
+            container.add(value)
+            self._attach(container, value, value)
+
+    def prune(self) -> int:
+        """
+        Unindexes containers that are no longer reachable from the root and returns how many were dropped.
+        Containers are reference counted, so a detached container that (directly or through others) contains itself
+        never reaches zero and stays indexed until prune() or rebuild().  Costs one walk over the containers.
+        """
+        reachable = {id(self.root)}
+        stack = [self.root]
+        while stack:
+            for _, child in _slots(stack.pop()):
+                if isinstance(child, _CONTAINERS) and id(child) not in reachable:
+                    reachable.add(id(child))
+                    stack.append(child)
+
+        dropped = [entry[0] for key, entry in self._containers.items() if key not in reachable]
+        for container in dropped:
+            del self._containers[id(container)]
+            for slot, child in _slots(container):
+                if not isinstance(child, _CONTAINERS):
+                    self._remove(container, slot)
+        return len(dropped)
+
+    def clear(self) -> None:
+        """Drops the whole index (the structure is left untouched); rebuild() restores it."""
+        self._locations, self._slot_keys, self._containers = {}, {}, {}
+
+    def delete(self, container, slot) -> None:
+        """Deletes container[slot] (or the member 'slot' of a set).  List deletes re-index the following items."""
+        self._check(container)
+        if isinstance(container, set):
+            self._detach(container, slot, slot)
+            container.remove(slot)
+        elif isinstance(container, dict):
+            self._detach(container, slot, container[slot])
+            del container[slot]
+        else:
+            slot = range(len(container))[slot]
+            tail = container[slot:]
+            for i, item in enumerate(tail, slot):
+                if not isinstance(item, _CONTAINERS):
+                    self._remove(container, i)
+            self._detach(container, slot, tail[0])
+            del container[slot]
+            for i, item in enumerate(tail[1:], slot):
+                if not isinstance(item, _CONTAINERS):
+                    self._add(container, i, item)
+
+
+def _slots(container):
+    """(slot, child) pairs of a list, dict or set."""
+    if isinstance(container, dict):
+        return list(container.items())
+    if isinstance(container, set):
+        return [(x, x) for x in container]
+    return list(enumerate(container))
@@ -1,13 +1,25 @@
 from typing import Any, TypeVar
-from ._replace_value import _replace_value_recursive, _replace_value_mutable, BREAK_SEARCH
+from concurrent.futures import ProcessPoolExecutor
+import os
+from ._replace_value import _replace_value_return, _replace_value_mutable, _compile_matcher, _compile_callback, BREAK_SEARCH
 from copy import deepcopy
+from functools import lru_cache
+import re
+from ._parallel import imap_chunks
 
 
 
 
 Iterables = TypeVar('Iterables', list, tuple, dict, set) 
 
-def replace_value_nested(a: Iterables, old_vals: tuple | Any , new_val, callback = None, mode = 'return') -> Iterables:
+def replace_value_nested(
+        a: Iterables, 
+        old_vals: tuple | Any = (), 
+        new_val = None, 
+        callback = None, 
+        mode = 'return',
+        replace_map: dict | list[tuple] | None = None
+    ) -> Iterables:
     """
     Replaces a value(s) in a nested data structure.  The value(s) to replace can be of any type,
     including the type of the data structures being searched through.
@@ -28,6 +40,14 @@ def replace_value_nested(a: Iterables, old_vals: tuple | Any , new_val, callback
         count += 1
         return new if count <= 10 else BREAK_SEARCH
 
+    Use 'replace_map' to replace many different values in one traversal.  Each key is replaced by its value:
+
+    replace_value_nested(a, replace_map={old_id: new_id for old_id, new_id in id_pairs})
+
+    Hashable values are matched with one hash lookup per node.  To match unhashable values (lists, dicts, ...),
+    pass 'replace_map' as an iterable of (old, new) pairs instead; they are keyed by 'hashable_repr'.
+    The callback receives each match with its own mapped value as 'new_val'.
+
     Additionally, callback may accept a 'parents' keyword that references a list of all the sequential parents
     that the found value is nested in.
     'parents[0]' is the immediate parent, while 'parent[-1]' is the full structure.
@@ -42,9 +62,11 @@ def replace_value_nested(a: Iterables, old_vals: tuple | Any , new_val, callback
     The 'mode' parameter switches between different algorithms:
 
         - 'return' (default)
-            Uses a recursive find and replace algorithm and returns a new data structure without affecting the old one.
-            Preserves child types but reinitializes them.  This algorithm is much slower than 'replace' and is subject
-            to recursive depth limit.  Accessing 'parents' in the callback will never show updated values.
+            Returns a new data structure without affecting the old one.  Only the containers on the path to a
+            replacement are copied (preserving child types); every untouched subtree is shared by reference with
+            the original, so copying (and the extra memory) scales with the number of hits, while the search itself
+            still visits every node.  Searches through tuples and has no
+            recursion depth limit.  Accessing 'parents' in the callback will never show updated values.
 
         - 'replace'
             Replaces the values in the structure and returns it.  Does not search through tuples and will keep
@@ -62,37 +84,183 @@ def replace_value_nested(a: Iterables, old_vals: tuple | Any , new_val, callback
     :param new_val: value to inject
     :param callback: method::old_val -> new_val -> new_val'
     :param mode: switches between different algorithms
+    :param replace_map: dict or iterable of (old_val, new_val) pairs, used alongside 'old_vals'
     :return: list, tuple, dict, or set
     """
 
+    match = _compile_matcher(old_vals, new_val, replace_map)
+    callback, wants_parents = _compile_callback(callback)
+    return _replace_with(a, match, callback, wants_parents, mode)
+
+
+def _replace_with(a: Iterables, match, callback, wants_parents: bool, mode: str) -> Iterables:
+    """Runs the algorithm selected by 'mode' with a compiled matcher and callback."""
     if mode == 'return':
-        return _replace_value_recursive()(a, old_vals, new_val, callback)
+        return _replace_value_return(a, match, callback, wants_parents)
     elif mode == 'replace':
         if isinstance(a, tuple):
             raise ValueError("Cannot replace a tuple")
-        return _replace_value_mutable(a, old_vals, new_val, callback)
+        return _replace_value_mutable(a, match, callback, wants_parents)
     elif mode == 'copy':
         if isinstance(a, tuple):
             raise ValueError("Cannot replace a tuple")
         new_a = deepcopy(a)
-        return _replace_value_mutable(new_a, old_vals, new_val, callback)
+        return _replace_value_mutable(new_a, match, callback, wants_parents)
     else:
         raise ValueError(f"{mode} is not a valid mode!\nValid modes: ['return', 'replace', 'copy']")
 
 
+#Per worker state for replace_value_batch, set once by the pool initializer
+_batch_spec = None
+
+def _batch_init(old_vals, new_val, callback, mode: str, replace_map) -> None:
+    global _batch_spec
+    _batch_spec = (_compile_matcher(old_vals, new_val, replace_map), *_compile_callback(callback), mode)
 
-def find_nth(string: str, sub_str: str, n: int, idx = 0) -> int:
+def _batch_chunk(docs: list) -> list:
+    return [_replace_with(doc, *_batch_spec) for doc in docs]
+
+
+def replace_value_batch(
+        docs, 
+        old_vals: tuple | Any = (), 
+        new_val = None, 
+        callback = None, 
+        mode = 'return',
+        replace_map: dict | list[tuple] | None = None,
+        workers: int | None = None,
+        chunksize: int = 64
+    ):
+    """
+    Applies the same replace_value_nested rewrite to every structure in the iterable 'docs' and yields the results
+    in order.  The work is fanned out to a process pool of 'workers' processes (default: one per CPU) in chunks of
+    'chunksize' documents; only a bounded number of chunks is in flight, so 'docs' may be a lazy stream.
+
+    Each worker compiles the matcher ('old_vals' / 'replace_map') and the callback adapter once.  The callback must
+    be picklable (defined at module level).  The input documents are never modified: in the pool they are copies,
+    and with workers=1 (everything runs in this process) 'replace' mode works on a deepcopy like 'copy' does.
+    Arguments are validated when replace_value_batch is called, before the first result is requested.
+
+    See replace_value_nested for the meaning of the other parameters.
+    """
+    if mode not in ('return', 'replace', 'copy'):
+        raise ValueError(f"{mode} is not a valid mode!\nValid modes: ['return', 'replace', 'copy']")
+    workers = workers if workers is not None else os.cpu_count() or 1
+
+    if workers <= 1:
+        #Match the pool's behaviour: documents are never modified in place, so 'replace' works on a copy here
+        mode = 'copy' if mode == 'replace' else mode
+        return _batch_serial(docs, _compile_matcher(old_vals, new_val, replace_map), *_compile_callback(callback), mode)
+    return _batch_pool(docs, old_vals, new_val, callback, mode, replace_map, workers, chunksize)
+
+
+def _batch_serial(docs, match, callback, wants_parents: bool, mode: str):
+    for doc in docs:
+        yield _replace_with(doc, match, callback, wants_parents, mode)
+
+
+def _batch_pool(docs, old_vals, new_val, callback, mode: str, replace_map, workers: int, chunksize: int):
+    #Documents are pickled to the workers anyway, so the deepcopy of 'copy' mode is redundant
+    mode = 'replace' if mode == 'copy' else mode
+    with ProcessPoolExecutor(workers, initializer=_batch_init,
+                             initargs=(old_vals, new_val, callback, mode, replace_map)) as executor:
+        yield from imap_chunks(executor, _batch_chunk, docs, chunksize, max_pending=workers * 2)
+
+
+def find_nth(string: str | bytes, sub_str: str | bytes, n: int, idx = 0) -> int:
     """
     Returns the index of the nth occurance of sub_str in string. (0-based)
     Returns -1 if there is no nth occurance.
+    Works on str, bytes, bytearray, mmap and memoryview without copying ('idx' is added to the result).
+    """
+    if not sub_str:
+        return idx
+    for i, index in enumerate(find_all(string, sub_str)):
+        if i >= n:
+            return idx + index
+    return -1
+
+
+def find_all(string: str | bytes, sub_str: str | bytes, start: int = 0, end: int | None = None):
+    """
+    Returns an iterator over the index of every (non-overlapping) occurance of sub_str in string[start:end].
+    Works on str, bytes, bytearray, mmap and memoryview without copying.  Use find_any for several needles.
     """
+    if isinstance(sub_str, (tuple, list)):
+        raise TypeError("find_all takes a single sub_str; use find_any for several needles")
+    if not sub_str:
+        raise ValueError("find_all needs a non-empty sub_str")
+    end = len(string) if end is None else end
+
+    if isinstance(string, memoryview):
+        #memoryview has no find(); the regex engine scans the buffer in place
+        return (m.start() for m in _needle_pattern(_needle_key((sub_str,))).finditer(string, start, end))
+    return _find_iter(string, sub_str, start, end)
+
+
+def _find_iter(string, sub_str, start: int, end: int):
     L = len(sub_str)
-    index = string.find(sub_str)
+    index = string.find(sub_str, start, end)
+    while index != -1:
+        yield index
+        index = string.find(sub_str, index + L, end)
+
+
+def find_any(string: str | bytes, needles: tuple | list, start: int = 0, end: int | None = None):
+    """
+    Returns an iterator over (index, needle) pairs for every (non-overlapping) occurance of any of 'needles' in
+    string[start:end], found in a single pass.  Where needles overlap, the longest one starting at the leftmost
+    position wins.  Works on str, bytes, bytearray, mmap and memoryview without copying.
+
+    The needles are compiled (and cached) as a trie-shaped regex, so each text position costs at most one walk down
+    the trie: the scan grows with the text length and needle length rather than the number of needles.
+    """
+    if not needles or not all(needles):
+        raise ValueError("find_any needles must be non-empty")
+    end = len(string) if end is None else end
+
+    pattern = _needle_pattern(_needle_key(needles))
+    if isinstance(string, str):
+        return ((m.start(), m.group()) for m in pattern.finditer(string, start, end))
+    return ((m.start(), bytes(m.group())) for m in pattern.finditer(string, start, end))
+
+
+def _needle_key(needles) -> tuple:
+    """Hashable cache key for the needles (bytearray / memoryview needles become bytes)."""
+    return tuple(n if isinstance(n, (str, bytes)) else bytes(n) for n in needles)
+
+
+@lru_cache(maxsize=64)
+def _needle_pattern(needles: tuple):
+    """
+    Compiles literal needles into a trie-shaped regex, e.g. ('ab', 'abc', 'ad') -> 'a(?:b(?:c)?|d)'.
+    Optional tails are greedy, so the longest needle matching at a position wins.
+    """
+    is_bytes = isinstance(needles[0], bytes)
+    #bytes needles are built as latin-1 text (one char per byte) and encoded back at the end
+    texts = [n.decode('latin-1') if is_bytes else n for n in set(needles)]
+
+    root = {}
+    for text in texts:
+        node = root
+        for ch in text:
+            node = node.setdefault(ch, {})
+        node[None] = None   #End of a needle
+
+    #Iterative post-order walk: children are emitted before their parent (needles may be arbitrarily long)
+    emitted = {}
+    stack = [(root, False)]
+    while stack:
+        node, ready = stack.pop()
+        if not ready:
+            stack.append((node, True))
+            stack.extend((child, False) for ch, child in node.items() if ch is not None)
+            continue
+        #Branches start with distinct characters, so at most one of them can match at a position
+        branches = [re.escape(ch) + emitted.pop(id(child)) for ch, child in node.items() if ch is not None]
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')' if branches else ''
+        emitted[id(node)] = '(?:' + body + ')?' if None in node and body else body
+
+    pattern = emitted[id(root)]
+    return re.compile(pattern.encode('latin-1') if is_bytes else pattern)
 
-    if index != -1:
-        if n > 0:
-            return find_nth(string[index + L:], sub_str, n - 1, idx + index + L)
-        else:
-            return idx + index
-    else:
-        return -1
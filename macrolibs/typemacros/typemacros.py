@@ -1,97 +1,141 @@
 from types import GeneratorType
+from collections.abc import Mapping
 from typing import Any, TypeVar
 import inspect
-from .hashmacros import hashable_repr
+from .hashmacros import hashable_repr, hashable_digest, DigestSet, SpillSet, BloomFilter, DIGEST_SIZE
+from ._vectorize import vector_union, vector_compliment, vector_intersect
+from ._parallel import parallel_filter
 
 
 Iterables = TypeVar('Iterables', list, tuple, dict, set)
 
+
+def _identity(x):
+    """Default 'compare_as'.  A named function so the vectorized path can recognize it."""
+    return x
+
+
+def _keying(
+        compare_as, 
+        digest: bool | int = False, 
+        verify: bool = False, 
+        max_keys: int | None = None, 
+        spill_dir: str | None = None
+    ) -> tuple:
+    """
+    Returns a (key, seen) pair for the 'compare_as' based set operations.
+
+    By default keys are 'hashable_repr' mirrors kept in a set.  If 'digest' is True (or a digest size in bytes),
+    keys are fixed-size 'hashable_digest' fingerprints instead.  'verify' confirms digest hits against the
+    original values (see DigestSet).  If 'max_keys' is set, keys are always digests and spill to disk once there
+    are more than 'max_keys' of them (see SpillSet).
+    """
+    if max_keys is not None:
+        if verify:
+            raise ValueError("'verify' is not supported with 'max_keys'")
+        size = DIGEST_SIZE if isinstance(digest, bool) else digest
+        return (lambda x: hashable_digest(compare_as(x), size)), SpillSet(max_keys, spill_dir)
+    if not digest:
+        return (lambda x: hashable_repr(compare_as(x))), set()
+    size = DIGEST_SIZE if digest is True else digest
+    if verify:
+        return compare_as, DigestSet(size, verify=True)
+    return (lambda x: hashable_digest(compare_as(x), size)), set()
+
+
 #Unions
 #----------------------------------------------------------------------------------------------------------------------
+def _union_all(
+        sequences,
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        vectorize: bool | None = None,
+        check: bool = False
+    ) -> list:
+    """
+    Single pass n-ary union engine.  Walks every sequence once with one shared seen-set and keeps the first
+    occurrence of each key in order.  If 'check' is set, every sequence must be a list or tuple.
+    """
+    if vectorize is not False and compare_as is _identity and not digest:
+        sequences = list(sequences)
+        if not check or all(isinstance(seq, list | tuple) for seq in sequences):
+            result = vector_union(sequences, force=bool(vectorize))
+            if result is not None:
+                return result
+
+    compare, seen = _keying(compare_as, digest, verify)
+    result = []
+    for seq in sequences:
+        if check and not isinstance(seq, list | tuple):
+            raise TypeError("'a' must be a list or tuple of lists or tuples if 'b' is empty")
+        for n in seq:
+            h = compare(n)
+            if h not in seen:
+                seen.add(h)
+                result.append(n)
+    return result
+
+
 def list_union(
         A: list | tuple | list[list] | tuple[list], 
         B: list | tuple | None = None,
-        compare_as = lambda x:x
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        vectorize: bool | None = None
     ) -> list:
     """
-    If 'b' is None, the function will perform an iterative union of all lists and tuples in 'a'.
+    If 'b' is None, the function will perform a single pass union of all lists and tuples in 'a'.
     In this case, 'a' must be a list or tuple of exclusively lists or  tuples.
     Otherwise, perform the union of 'a' and 'b'
     Use 'compare_as' to specify a key function for comparison.
+    Use 'digest' to compare by fixed-size fingerprints instead of full 'hashable_repr' keys (see _keying).
+    Flat int or float lists, tuples and arrays use NumPy kernels when available.  Set 'vectorize' to True to force this
+    regardless of size or to False to disable it.
     """
     if B is None:
-        l_union = list()
-        for n in A:
-            if isinstance(n, list | tuple):
-                l_union = list_union(l_union, n, compare_as)
-            else:
-                raise TypeError("'a' must be a list or tuple of lists or tuples if 'b' is empty")
-        return l_union
+        return _union_all(A, compare_as, digest, verify, vectorize, check=True)
     else:
-        compare = lambda x: hashable_repr(compare_as(x))
-        seen = set()
-        result = []
-        for n in A:
-            h = compare(n)
-            if h not in seen:
-                seen.add(h)
-                result.append(n)
-        for n in B:
-            h = compare(n)
-            if h not in seen:
-                seen.add(h)
-                result.append(n)
-        return result
+        return _union_all((A, B), compare_as, digest, verify, vectorize)
 
 
 def tuple_union(
         A: list | tuple | list[tuple] | tuple[tuple], 
         B: list | tuple | None = None, 
-        compare_as = lambda x:x
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        vectorize: bool | None = None
     ) -> tuple:
     """
-    If 'b' is None, the function will perform an iterative union of all lists and tuples in 'a'.
+    If 'b' is None, the function will perform a single pass union of all lists and tuples in 'a'.
     In this case, 'a' must be a list or tuple of exclusively lists or  tuples.
     Otherwise, perform the union of 'a' and 'b'
     Use 'compare_as' to specify a key function for comparison.
+    Use 'digest' to compare by fixed-size fingerprints instead of full 'hashable_repr' keys (see _keying).
+    Flat int or float lists, tuples and arrays use NumPy kernels when available.  Set 'vectorize' to True to force this
+    regardless of size or to False to disable it.
     """
     if B is None:
-        t_union = ()
-        for n in A:
-            if isinstance(n, list | tuple):
-                t_union = tuple_union(t_union, n, compare_as)
-            else:
-                raise TypeError("'a' must be a list or tuple of lists or tuples if 'b' is empty")
-        return t_union
+        return tuple(_union_all(A, compare_as, digest, verify, vectorize, check=True))
     else:
-        compare = lambda x: hashable_repr(compare_as(x))
-        seen = set()
-        result = []
-        for n in A:
-            h = compare(n)
-            if h not in seen:
-                seen.add(h)
-                result.append(n)
-        for n in B:
-            h = compare(n)
-            if h not in seen:
-                seen.add(h)
-                result.append(n)
-        return tuple(result)
+        return tuple(_union_all((A, B), compare_as, digest, verify, vectorize))
 
 
 def dict_union(A: dict | list[dict] | tuple[dict], B: dict | None = None) -> dict:
     """
-    If 'b' is None, the function will perform an iterative union of all dicts in 'a'.
+    If 'b' is None, the function will perform a single pass union of all dicts in 'a'.
     In this case, 'a' must be a list or tuple of exclusively dicts.
     Otherwise, perform the union of 'a' and 'b'
-    (Leftmost keys have precedence)
+    (Keys keep the order they first appear in, but the rightmost value of a key wins, as with a | b)
+    See DictUnionView for a lazy, copy-free union of many large dicts (note that it is leftmost-wins).
     """
     if B is None:
         d_union = dict()
         for n in A:
             if isinstance(n, dict):
-                d_union = dict_union(d_union, n)
+                d_union.update(n)
             else:
                 raise TypeError("'a' must be a list or tuple of dicts if 'b' is empty")
         return d_union
@@ -101,9 +145,89 @@ def dict_union(A: dict | list[dict] | tuple[dict], B: dict | None = None) -> dic
         return dict(A | B)
 
 
+class DictUnionView(Mapping):
+    """
+    DictUnionView(layers: list[dict] | tuple[dict], deep: bool = False, cache: bool = False)
+
+    Read-only lazy union of a stack of dicts.  Nothing is copied; each lookup is resolved through the layers and
+    the leftmost layer containing a key wins (like collections.ChainMap).
+
+    This is the opposite precedence of dict_union, where the rightmost value wins.  DictUnionView(dicts[::-1])
+    has the same values as dict_union(dicts) (its keys are then ordered by first occurrence in the reversed stack).
+
+    If 'deep' is set, a key whose leftmost value is a dict is merged with the dict values of the same key in the
+    layers to its right, recursively, as another DictUnionView.  Subtrees found in only one layer are returned
+    as they are.
+
+    If 'cache' is set, resolved keys are remembered so repeated reads flatten the view incrementally.  Only use
+    it while the layers are not mutated (or call clear_cache() after).
+    """
+    def __init__(self, layers: list[dict] | tuple[dict], deep: bool = False, cache: bool = False):
+        for layer in layers:
+            if not isinstance(layer, Mapping):
+                raise TypeError("'layers' must be a list or tuple of dicts")
+        self.layers = tuple(layers)
+        self.deep = deep
+        self._cache = {} if cache else None
+
+    def _resolve(self, key):
+        if not self.deep:
+            for layer in self.layers:
+                if key in layer:
+                    return layer[key]
+            raise KeyError(key)
+
+        found = [layer[key] for layer in self.layers if key in layer]
+        if not found:
+            raise KeyError(key)
+        if not isinstance(found[0], Mapping):
+            return found[0]
+        subtrees = [v for v in found if isinstance(v, Mapping)]
+        return subtrees[0] if len(subtrees) == 1 else DictUnionView(subtrees, True, self._cache is not None)
+
+    def __getitem__(self, key):
+        if self._cache is None:
+            return self._resolve(key)
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = self._resolve(key)
+            return value
+
+    def __contains__(self, key) -> bool:
+        return any(key in layer for layer in self.layers)
+
+    def __iter__(self):
+        #Keys in order of first occurrence, like dict_union
+        seen = set()
+        for layer in self.layers:
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self) -> int:
+        return len(set().union(*self.layers))
+
+    def __repr__(self) -> str:
+        return f"DictUnionView({list(self.layers)!r}, deep={self.deep})"
+
+    def clear_cache(self) -> None:
+        if self._cache is not None:
+            self._cache.clear()
+
+    def materialize(self) -> dict:
+        """
+        Returns the union as a plain dict.  With 'deep', only merged subtrees are rebuilt; subtrees that come from
+        a single layer are shared by reference.
+        """
+        return {key: value.materialize() if isinstance(value, DictUnionView) else value
+                for key, value in ((key, self[key]) for key in self)}
+
+
 def set_union(A: set | list[set] | tuple[set], B: set | None = None) -> set:
     """
-    If 'b' is None, the function will perform an iterative union of all sets in 'a'.
+    If 'b' is None, the function will perform a single pass union of all sets in 'a'.
     In this case, 'a' must be a list or tuple of exclusively sets.
     Otherwise, perform the union of 'a' and 'b'
     """
@@ -111,7 +235,7 @@ def set_union(A: set | list[set] | tuple[set], B: set | None = None) -> set:
         s_union = set()
         for n in A:
             if isinstance(n, set):
-                s_union = set_union(s_union, n)
+                s_union.update(n)
             else:
                 raise TypeError("'a' must be a list or tuple of sets if 'b' is empty")
         return s_union
@@ -121,18 +245,30 @@ def set_union(A: set | list[set] | tuple[set], B: set | None = None) -> set:
         return set(A | B)
 
 
-def type_union(A: Iterables , B: Iterables | None = None, compare_as = lambda x:x) -> Iterables:
+def type_union(
+        A: Iterables, 
+        B: Iterables | None = None, 
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        vectorize: bool | None = None
+    ) -> Iterables:
     """General union for all types.  A and B must be the same type unless B is None
-    In this case, 'A' must be a list or tuple of exclusively sets.
+    In this case, 'A' must be a list or tuple of exclusively one type, which is unioned in a single pass.
     Otherwise, perform the union of 'a' and 'b'
     Use 'compare_as' to specify a key function for comparison.
     """
     if type(A) != type(B) and B is not None:
         raise TypeError("A and B must be the same type!")
+    if B is None and isinstance(A, list | tuple) and A:
+        if isinstance(A[0], dict):
+            return dict_union(A)
+        elif isinstance(A[0], set):
+            return set_union(A)
     if isinstance(A, list) and (isinstance(B, list) or B is None):
-        return list_union(A, B, compare_as)
+        return list_union(A, B, compare_as, digest, verify, vectorize)
     elif isinstance(A, tuple) and (isinstance(B, tuple) or B is None):
-        return tuple_union(A, B, compare_as)
+        return tuple_union(A, B, compare_as, digest, verify, vectorize)
     elif isinstance(A, dict) and (isinstance(B, dict) or B is None):
         return dict_union(A, B)
     elif isinstance(A, set) and (isinstance(B, set) or B is None):
@@ -144,19 +280,56 @@ def type_union(A: Iterables , B: Iterables | None = None, compare_as = lambda x:
 #Compliments
 #-------------------------------------------------------------------------------------------------------------------
 
-def list_compliment(A: list, B: list, compare_as = lambda x:x) -> list:
+def list_compliment(
+        A: list, 
+        B: list | BloomFilter, 
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        vectorize: bool | None = None,
+        workers: int | None = None,
+        error_rate: float | None = None
+    ) -> list:
     """Returns a list containing all items in A that are not in B.
-    Use 'compare_as' to specify a key function for comparison."""
-    compare = lambda x: hashable_repr(compare_as(x))
-    seen = set(map(compare, B))
+    Use 'compare_as' to specify a key function for comparison and 'digest' to compare by fingerprints.
+    Flat int or float lists, tuples and arrays use NumPy kernels when available ('vectorize' forces or disables this).
+    Set 'workers' to generate digest keys across a process pool (see _parallel.parallel_filter).
+    Set 'error_rate' (or pass a prebuilt BloomFilter as B) to test membership against a compact Bloom filter of B;
+    items may then be dropped by mistake at about that rate."""
+    if error_rate is not None or isinstance(B, BloomFilter):
+        bloom = B if isinstance(B, BloomFilter) else BloomFilter.build(B, error_rate, compare_as)
+        return [n for n in A if compare_as(n) not in bloom]
+
+    if workers is not None and workers > 1:
+        if verify:
+            raise ValueError("'verify' is not supported with 'workers'")
+        size = DIGEST_SIZE if isinstance(digest, bool) else digest
+        result = parallel_filter(A, B, compare_as, size, workers, keep=False)
+        if result is not None:
+            return result
+
+    if vectorize is not False and compare_as is _identity and not digest:
+        result = vector_compliment(A, B, force=bool(vectorize))
+        if result is not None:
+            return result
+
+    compare, seen = _keying(compare_as, digest, verify)
+    seen.update(map(compare, B))
     return [n for n in A if compare(n) not in seen]
 
-def tuple_compliment(A: tuple, B: tuple, compare_as = lambda x:x) -> tuple:
+def tuple_compliment(
+        A: tuple, 
+        B: tuple | BloomFilter, 
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        vectorize: bool | None = None,
+        workers: int | None = None,
+        error_rate: float | None = None
+    ) -> tuple:
     """Returns a tuple containing all items in A that are not in B.
-    Use 'compare_as' to specify a key function for comparison."""
-    compare = lambda x: hashable_repr(compare_as(x))
-    seen = set(map(compare, B))
-    return tuple(n for n in A if compare(n) not in seen)
+    Use 'compare_as' to specify a key function for comparison and 'digest' to compare by fingerprints."""
+    return tuple(list_compliment(A, B, compare_as, digest, verify, vectorize, workers, error_rate))
 
 def dict_compliment(A: dict, B: dict, match_vals= False) -> dict:
     """Returns a dict containing all keys in A that are not in B"""
@@ -167,15 +340,24 @@ def set_compliment(A: set, B: set) -> set:
     """Returns a set containing all members in A that are not in B"""
     return set(a for a in A if a not in B)
 
-def type_compliment(A: Iterables, B: Iterables, compare_as = lambda x:x) -> Iterables:
+def type_compliment(
+        A: Iterables, 
+        B: Iterables, 
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        vectorize: bool | None = None,
+        workers: int | None = None,
+        error_rate: float | None = None
+    ) -> Iterables:
     """General compliment for all types.  A and B must be the same type.
     Use 'compare_as' to specify a key function for comparison."""
     if type(A) != type(B):
         raise TypeError("A and B must be the same type!")
     if isinstance(A, list) and isinstance(B, list):
-        return list_compliment(A, B, compare_as)
+        return list_compliment(A, B, compare_as, digest, verify, vectorize, workers, error_rate)
     elif isinstance(A, tuple) and isinstance(B, tuple):
-        return tuple_compliment(A, B, compare_as)
+        return tuple_compliment(A, B, compare_as, digest, verify, vectorize, workers, error_rate)
     elif isinstance(A, dict) and isinstance(B, dict):
         return dict_compliment(A, B)
     elif isinstance(A, set) and isinstance(B, set):
@@ -187,19 +369,56 @@ def type_compliment(A: Iterables, B: Iterables, compare_as = lambda x:x) -> Iter
 #Intersections
 #---------------------------------------------------------------------------------------------------------------------
 
-def list_intersect(A: list, B: list, compare_as = lambda x:x) -> list:
+def list_intersect(
+        A: list, 
+        B: list | BloomFilter, 
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        vectorize: bool | None = None,
+        workers: int | None = None,
+        error_rate: float | None = None
+    ) -> list:
     """Returns a list returning all items in A that are also in B.
-    Use 'compare_as' to specify a key function for comparison."""
-    compare = lambda x: hashable_repr(compare_as(x))
-    seen = set(map(compare, B))
+    Use 'compare_as' to specify a key function for comparison and 'digest' to compare by fingerprints.
+    Flat int or float lists, tuples and arrays use NumPy kernels when available ('vectorize' forces or disables this).
+    Set 'workers' to generate digest keys across a process pool (see _parallel.parallel_filter).
+    Set 'error_rate' (or pass a prebuilt BloomFilter as B) to test membership against a compact Bloom filter of B;
+    items may then be kept by mistake at about that rate."""
+    if error_rate is not None or isinstance(B, BloomFilter):
+        bloom = B if isinstance(B, BloomFilter) else BloomFilter.build(B, error_rate, compare_as)
+        return [n for n in A if compare_as(n) in bloom]
+
+    if workers is not None and workers > 1:
+        if verify:
+            raise ValueError("'verify' is not supported with 'workers'")
+        size = DIGEST_SIZE if isinstance(digest, bool) else digest
+        result = parallel_filter(A, B, compare_as, size, workers, keep=True)
+        if result is not None:
+            return result
+
+    if vectorize is not False and compare_as is _identity and not digest:
+        result = vector_intersect(A, B, force=bool(vectorize))
+        if result is not None:
+            return result
+
+    compare, seen = _keying(compare_as, digest, verify)
+    seen.update(map(compare, B))
     return [n for n in A if compare(n) in seen]
 
-def tuple_intersect(A: tuple, B: tuple, compare_as = lambda x:x) -> tuple:
+def tuple_intersect(
+        A: tuple, 
+        B: tuple | BloomFilter, 
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        vectorize: bool | None = None,
+        workers: int | None = None,
+        error_rate: float | None = None
+    ) -> tuple:
     """Returns a list returning all items in A that are also in B.
-    Use 'compare_as' to specify a key function for comparison."""
-    compare = lambda x: hashable_repr(compare_as(x))
-    seen = set(map(compare, B))
-    return tuple([n for n in A if compare(n) in seen])
+    Use 'compare_as' to specify a key function for comparison and 'digest' to compare by fingerprints."""
+    return tuple(list_intersect(A, B, compare_as, digest, verify, vectorize, workers, error_rate))
 
 def dict_intersect(A: dict, B: dict, match_vals= False) -> dict:
     """Returns a dict returning all items (keys:vals) in A that are also in B if match_vals is True
@@ -211,15 +430,25 @@ def set_intersect(A: set, B: set) -> set:
     """Returns a set returning all members in A that are also in B"""
     return set(a for a in A if a in B)
 
-def type_intersect(A: Iterables, B: Iterables, match_vals= False, compare_as = lambda x:x) -> Iterables:
+def type_intersect(
+        A: Iterables, 
+        B: Iterables, 
+        match_vals= False, 
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        vectorize: bool | None = None,
+        workers: int | None = None,
+        error_rate: float | None = None
+    ) -> Iterables:
     """General intersection for all types.  A and B must be the same type. Pass match_vals on to dicts.
     Use 'compare_as' to specify a key function for comparison."""
     if type(A) != type(B):
         raise TypeError("A and B must be the same type!")
     if isinstance(A, list) and isinstance(B, list):
-        return list_intersect(A, B, compare_as)
+        return list_intersect(A, B, compare_as, digest, verify, vectorize, workers, error_rate)
     elif isinstance(A, tuple) and isinstance(B, tuple):
-        return tuple_intersect(A, B, compare_as)
+        return tuple_intersect(A, B, compare_as, digest, verify, vectorize, workers, error_rate)
     elif isinstance(A, dict) and isinstance(B, dict):
         return dict_intersect(A, B, match_vals)
     elif isinstance(A, set) and isinstance(B, set):
@@ -228,6 +457,89 @@ def type_intersect(A: Iterables, B: Iterables, match_vals= False, compare_as = l
         raise TypeError(f"type_union(A: ${type(A)}, B: ${type(B)})\nWrong type signature")
 
 
+#Iterators
+#---------------------------------------------------------------------------------------------------------------------
+
+def iter_union(
+        A, 
+        B = None, 
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        max_keys: int | None = None,
+        spill_dir: str | None = None
+    ):
+    """
+    Lazy version of list_union for any iterables.  Yields the first occurrence of each item as it is read.
+    If 'B' is None, 'A' must be an iterable of iterables.
+    Use 'compare_as' to specify a key function for comparison and 'digest' to compare by fingerprints.
+    Set 'max_keys' to bound memory: the seen-keys index spills to a file in 'spill_dir' once it grows past it.
+    """
+    compare, seen = _keying(compare_as, digest, verify, max_keys, spill_dir)
+    try:
+        for seq in (A if B is None else (A, B)):
+            for n in seq:
+                h = compare(n)
+                if h not in seen:
+                    seen.add(h)
+                    yield n
+    finally:
+        if isinstance(seen, SpillSet):
+            seen.close()
+
+
+def iter_compliment(
+        A, 
+        B, 
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        max_keys: int | None = None,
+        spill_dir: str | None = None
+    ):
+    """
+    Lazy version of list_compliment for any iterables.  'B' is read in full first, then each item of 'A' that
+    is not in 'B' is yielded as it is read.
+    Use 'compare_as' to specify a key function for comparison and 'digest' to compare by fingerprints.
+    Set 'max_keys' to bound memory: the seen-keys index spills to a file in 'spill_dir' once it grows past it.
+    """
+    compare, seen = _keying(compare_as, digest, verify, max_keys, spill_dir)
+    try:
+        seen.update(map(compare, B))
+        for n in A:
+            if compare(n) not in seen:
+                yield n
+    finally:
+        if isinstance(seen, SpillSet):
+            seen.close()
+
+
+def iter_intersect(
+        A, 
+        B, 
+        compare_as = _identity,
+        digest: bool | int = False,
+        verify: bool = False,
+        max_keys: int | None = None,
+        spill_dir: str | None = None
+    ):
+    """
+    Lazy version of list_intersect for any iterables.  'B' is read in full first, then each item of 'A' that
+    is also in 'B' is yielded as it is read.
+    Use 'compare_as' to specify a key function for comparison and 'digest' to compare by fingerprints.
+    Set 'max_keys' to bound memory: the seen-keys index spills to a file in 'spill_dir' once it grows past it.
+    """
+    compare, seen = _keying(compare_as, digest, verify, max_keys, spill_dir)
+    try:
+        seen.update(map(compare, B))
+        for n in A:
+            if compare(n) in seen:
+                yield n
+    finally:
+        if isinstance(seen, SpillSet):
+            seen.close()
+
+
 #Syntax Converters
 #----------------------------------------------------------------------------------------------------------------------
 
@@ -260,30 +572,47 @@ def maybe_arg(func, pass_to_kwargs= False):
     "pass_to_kwargs" tag.  If set to True, positional arguments with a default value will also be filled.*
 
     *All positional kwargs will be overwritten by manually running with kwargs.
-    """
-    POSITIONAL_OR_KEYWORD = inspect.Parameter.POSITIONAL_OR_KEYWORD
-    EMPTY = inspect.Parameter.empty
-    VAR_POSITIONAL = inspect.Parameter.VAR_POSITIONAL
 
-    params = inspect.signature(func).parameters.items()
-    required_pars = tuple(par for _, par in params
-                          if par.kind in (POSITIONAL_OR_KEYWORD, VAR_POSITIONAL) and par.default is EMPTY)
+    Positional-only parameters follow the same rule: those with a default are only filled with "pass_to_kwargs",
+    and passing one by keyword is ignored like any unknown keyword argument.
+
+    The signature is inspected once.  Each new call shape (number of args, kwarg names) is resolved into a
+    binding plan that is cached, so every call is a direct call without exception driven retries.
+    """
+    Parameter = inspect.Parameter
+    params = inspect.signature(func).parameters.values()
+
+    positional = [par for par in params if par.kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)]
+    n_required = sum(1 for par in positional if par.default is Parameter.empty)
+    var_positional = any(par.kind is Parameter.VAR_POSITIONAL for par in params)
+    var_keyword = any(par.kind is Parameter.VAR_KEYWORD for par in params)
+    keywords = {par.name for par in params if par.kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)}
+    positions = {par.name: i for i, par in enumerate(positional) if par.kind is Parameter.POSITIONAL_OR_KEYWORD}
+
+    def plan(n_args: int, kw_names: tuple) -> tuple:
+        """Returns (number of args to keep, kwarg names to keep or None for all)."""
+        if not var_positional:
+            if not pass_to_kwargs and n_required:
+                n_args = min(n_args, n_required)
+            n_args = min(n_args, len(positional))
+        keep = kw_names if var_keyword else tuple(k for k in kw_names if k in keywords)
+        #Drop args (right to left) that would give a kwarg multiple values
+        conflicts = [positions[k] for k in keep if positions.get(k, n_args) < n_args]
+        if conflicts:
+            n_args = min(conflicts)
+        return n_args, (None if len(keep) == len(kw_names) else keep)
+
+    plans = {}
 
     def wrapper(*args, **kwargs):
-        args = args if pass_to_kwargs or not required_pars or required_pars[-1].kind is VAR_POSITIONAL \
-            else args[:len(required_pars)]
+        shape = (len(args), tuple(kwargs))
         try:
-            return func(*args, **kwargs)
-        except TypeError as e:
-            s = str(e)
-            if ("positional argument" in s and "given" in s) or "multiple values " in s:
-                return wrapper(*args[:-1], **kwargs)
-            elif "keyword argument '" in s:
-                pos = s.index("keyword argument '") + 18
-                k = s[pos:][:s[pos:].index("\'")]
-                return wrapper(*args, **dict_compliment(kwargs,{k:kwargs[k]}))
-            else:
-                raise e
+            n_args, keep = plans[shape]
+        except KeyError:
+            n_args, keep = plans[shape] = plan(*shape)
+        if keep is None:
+            return func(*args[:n_args], **kwargs)
+        return func(*args[:n_args], **{k: kwargs[k] for k in keep})
 
     return wrapper
 
@@ -297,22 +626,44 @@ def get_attributes(A: type) -> dict:
 #Functors
 #---------------------------------------------------------------------------------------------------------------------
 
+#Methods that never return an instance of their own base type.  'fast' copies leave these unwrapped.
+_NON_REFLEXIVE = frozenset((
+    #Conversions and protocols (the conversions must return the exact builtin type)
+    '__len__', '__bool__', '__contains__', '__iter__', '__reversed__', '__length_hint__',
+    '__index__', '__int__', '__float__', '__complex__', '__bytes__', '__buffer__', '__release_buffer__',
+    '__getnewargs__', '__getnewargs_ex__', '__getstate__', '__class_getitem__', '__divmod__', '__rdivmod__',
+    #Mutators (return None or self)
+    '__setitem__', '__delitem__', '__iadd__', '__isub__', '__imul__', '__iand__', '__ior__', '__ixor__',
+    'append', 'extend', 'insert', 'remove', 'clear', 'sort', 'reverse', 'add', 'discard', 'update',
+    'difference_update', 'intersection_update', 'symmetric_difference_update',
+    #Queries
+    'index', 'count', 'find', 'rfind', 'rindex', 'startswith', 'endswith', 'keys', 'values', 'items',
+    'isdisjoint', 'issubset', 'issuperset', 'is_integer', 'isalnum', 'isalpha', 'isascii', 'isdecimal',
+    'isdigit', 'isidentifier', 'islower', 'isnumeric', 'isprintable', 'isspace', 'istitle', 'isupper',
+))
+
+
 #TODO: UNTESTED! functor mapping of morphisms works for basic types.
 class copy_type():
     """
-    copy_type(basetype: type, name: str, attributes: dict) -> type
+    copy_type(basetype: type, name: str, attributes: dict, fast: bool = False) -> type
 
     Create a copy of a type into a new namespace.  If a namespace already exists, it will not create a new type but
     return the already cached type.
+
+    With 'fast', the new type is generated with __slots__ = () (no instance __dict__), methods that never return
+    the base type are inherited as they are, and only the remaining methods go through a cheap re-wrapping path.
     """
     types = [int, float, str, list, tuple, dict, set, frozenset, bool, complex, bytes, bytearray, memoryview, type, object]
     type_cache = {t.__name__:t for t in types}
 
-    def __new__(cls, basetype: type, name: str, attributes: dict | None = None) -> type:
+    def __new__(cls, basetype: type, name: str, attributes: dict | None = None, fast: bool = False) -> type:
         attributes = attributes if attributes is not None else {}
         if name not in cls.type_cache:
             #Default __repr__
             new_attributes = {"__repr__":lambda self: f"{name}({basetype(self)})"} | attributes
+            if fast:
+                new_attributes = {"__slots__": ()} | new_attributes
 
             #Create new type
             new_type = type(name, (basetype,), new_attributes)
@@ -325,13 +676,23 @@ class copy_type():
 
                 return type_wrapper
 
+            def wrap_end_type_fast(f):
+                def type_wrapper(*args, **kwargs):
+                    result = f(*args, **kwargs)
+                    return new_type(result) if type(result) is basetype else result
+
+                return type_wrapper
+
             #Add more to this list if shit starts breaking
             exclude_attrs = dir(object) + list(attributes)  #Dont map user defined attributes!
+            if fast:
+                exclude_attrs = set(exclude_attrs) | _NON_REFLEXIVE | {'__slots__'}
+            wrap = wrap_end_type_fast if fast else wrap_end_type
 
             #setattrs for new_type
             for meth_name in dir(new_type):
-                if meth_name not in exclude_attrs and callable(meth_attr := getattr(basetype, meth_name)):
-                    setattr(new_type, meth_name, wrap_end_type(meth_attr))
+                if meth_name not in exclude_attrs and callable(meth_attr := getattr(basetype, meth_name, None)):
+                    setattr(new_type, meth_name, wrap(meth_attr))
 
             #Cache type
             cls.type_cache[name] = new_type
@@ -0,0 +1,96 @@
+import io
+import os
+import stat
+import json
+import random
+import pytest
+from macrolibs.filemacros import replace_json_stream, save_json, open_json
+from macrolibs.filemacros.jsonmacros import JsonSaver, _JsonStream, _compile_matcher, _MISS
+from macrolibs.typemacros import replace_value_nested
+
+
+SCALARS = ["a", "b", "key", "", "é", "\\", 0, 1, -1, 2.5, 1e20, True, False, None]
+
+
+def random_doc(rng: random.Random, depth: int = 0):
+    roll = rng.random()
+    if depth > 3 or roll < 0.4:
+        return rng.choice(SCALARS)
+    if roll < 0.7:
+        return [random_doc(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    #Keys are drawn from the same strings as the values so they collide with 'old_vals'
+    return {rng.choice(["a", "b", "key", "", "é"]): random_doc(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+
+
+def run_stream(text: str, old_vals, new_val, chunk_size: int) -> str:
+    src, dst = io.StringIO(text), io.StringIO()
+    _JsonStream(src, dst, _compile_matcher(old_vals, new_val), lambda old, new, path: new, chunk_size).run()
+    return dst.getvalue()
+
+
+def test_matches_replace_value_nested():
+    rng = random.Random(15)
+    for _ in range(2000):
+        doc = random_doc(rng)
+        old_vals = tuple(rng.sample(SCALARS, 2))
+        text = json.dumps(doc, indent=rng.choice([None, 2]))
+        out = run_stream(text, old_vals, "NEW", rng.choice([1, 3, 16, 1 << 16]))
+        assert json.loads(out) == replace_value_nested(json.loads(text), old_vals, "NEW")
+
+
+def test_keys_are_never_replaced(tmp_path):
+    src, dst = tmp_path / "in.json", tmp_path / "out.json"
+    src.write_text('{"a": "a", "b": ["a", {"a": 1}]}')
+    assert replace_json_stream(str(src), str(dst), "a", "NEW") == 2
+    assert dst.read_text() == '{"a": "NEW", "b": ["NEW", {"a": 1}]}'
+
+
+@pytest.mark.parametrize("text", ['[1, "x\x01y", 2]', '[truex, 1]', '[1, @, 2]', '[12abc]', '["\\q"]'])
+def test_malformed_raises_before_eof(text):
+    #Anything after the bad token must not be read before the error is raised
+    src = io.StringIO(text + " " * (1 << 20))
+    with pytest.raises(json.JSONDecodeError):
+        _JsonStream(src, io.StringIO(), lambda v: _MISS, None, 16).run()
+    assert src.tell() < 1024
+
+
+def test_atomic_save_uses_umask_and_keeps_mode(tmp_path):
+    path = tmp_path / "data.json"
+    old = os.umask(0o027)
+    try:
+        save_json({"a": 1}, str(path), atomic=True)
+    finally:
+        os.umask(old)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    path.chmod(0o604)
+    save_json({"a": 2}, str(path), atomic=True)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o604
+    assert open_json(str(path)) == {"a": 2}
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_save_after_close_writes_synchronously(tmp_path):
+    saver = JsonSaver()
+    saver.save({"a": 1}, str(tmp_path / "a.json"))
+    saver.close()
+    saver.save({"b": 2}, str(tmp_path / "b.json"))
+    assert json.loads((tmp_path / "a.json").read_text()) == {"a": 1}
+    assert json.loads((tmp_path / "b.json").read_text()) == {"b": 2}
+
+
+def test_stream_in_place(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('{"a": ["x", "y", "x"]}')
+    path.chmod(0o604)
+    assert replace_json_stream(str(path), str(path), "x", "z") == 2
+    assert path.read_text() == '{"a": ["z", "y", "z"]}'
+    assert stat.S_IMODE(path.stat().st_mode) == 0o604
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_stream_failure_leaves_no_output(tmp_path):
+    src, dst = tmp_path / "in.json", tmp_path / "out.json"
+    src.write_text('["x", ' * 10000 + '@]')
+    with pytest.raises(json.JSONDecodeError):
+        replace_json_stream(str(src), str(dst), "x", "z", chunk_size=16)
+    assert [p.name for p in tmp_path.iterdir()] == ["in.json"]
@@ -0,0 +1,14 @@
+import pytest
+from macrolibs.misc.memoize import memoize
+
+
+@pytest.mark.parametrize("key", ["repr", "digest"])
+def test_kwargs_do_not_collide_with_positional(key):
+    @memoize(key=key)
+    def f(*args, **kwargs):
+        return args, kwargs
+
+    assert f(1, a=1) == ((1,), {'a': 1})
+    assert f((1,), {'a': 1}) == (((1,), {'a': 1}), {})
+    assert f([1], a=[2]) == (([1],), {'a': [2]})
+    assert f.cache_info()['misses'] == 3
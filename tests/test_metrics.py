@@ -0,0 +1,25 @@
+from macrolibs.misc.metrics import MetricsRegistry, _duration
+
+
+def test_duration_units():
+    assert _duration(0, 4) == '0ns'
+    assert _duration(350e-9, 4) == '350ns'
+    assert _duration(999.96e-9, 4) == '1us'
+    assert _duration(8.652e-6, 4) == '8.652us'
+    assert _duration(0.02017, 4) == '20.17ms'
+    assert _duration(0.9999999, 4) == '1s'
+    assert _duration(4380.0, 4) == '4380s'
+
+
+def test_report_sub_microsecond():
+    registry = MetricsRegistry()
+    fast, slow = registry.metric('fast'), registry.metric('slow')
+    for _ in range(100):
+        fast.record(350)
+    slow.record(20_000_000)
+    lines = registry.report().splitlines()
+    assert lines[0].split() == ['calls', 'errors', 'total', 'mean', 'p50', 'p90', 'p99', 'max', 'name']
+    assert lines[1].split()[0] == '1' and lines[1].endswith('slow') and '20ms' in lines[1]
+    fast_cells = lines[2].split()
+    assert fast_cells[:3] == ['100', '0', '35us'] and fast_cells[-1] == 'fast'
+    assert all(cell.endswith('ns') and cell[0] != '0' for cell in fast_cells[3:8])
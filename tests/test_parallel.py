@@ -0,0 +1,34 @@
+import pytest
+from macrolibs.typemacros import list_intersect, list_compliment
+from macrolibs.typemacros import _parallel
+
+
+class Item:
+    """Plain object: hashable_digest keys it by id()."""
+    def __init__(self, n):
+        self.n = n
+
+
+@pytest.fixture(params=['fork', 'pickle'])
+def start_method(request, monkeypatch):
+    if request.param == 'fork':
+        if _parallel._fork_context() is None:
+            pytest.skip("fork is not available")
+    else:
+        monkeypatch.setattr(_parallel, '_fork_context', lambda: None)
+    return request.param
+
+
+def test_workers_match_serial(start_method):
+    A = [[i % 7, str(i)] for i in range(300)] + list(range(50))
+    B = [[i % 7, str(i)] for i in range(0, 300, 3)] + list(range(25))
+    for func in (list_intersect, list_compliment):
+        assert func(A, B, workers=2) == func(A, B)
+
+
+def test_workers_identity_keyed_objects(start_method):
+    objs = [Item(i) for i in range(10)]
+    assert list_intersect(objs, objs[:3], workers=2) == objs[:3]
+    assert list_compliment(objs, objs[:3], workers=2) == objs[3:]
+    nested = [[o, 1] for o in objs]
+    assert list_intersect(nested, nested[:3], workers=2) == nested[:3]
@@ -0,0 +1,143 @@
+import sys
+import pytest
+from macrolibs.typemacros import replace_value_nested, BREAK_SEARCH
+
+
+def tagged(old, new):
+    #Records which object was found at each slot: 1, 1.0 and True are equal but distinguishable by type
+    return ('hit', type(old).__name__)
+
+
+def nested(depth: int, leaf):
+    """[[[...[leaf]...]]] nested 'depth' lists deep."""
+    doc = [leaf]
+    for _ in range(depth - 1):
+        doc = [doc]
+    return doc
+
+
+def leaf_of(doc):
+    while isinstance(doc, list):
+        doc = doc[0]
+    return doc
+
+
+#'replace' mode
+#----------------------------------------------------------------------------------------------------------------------
+
+def test_replace_writes_the_visited_slot_when_values_repeat():
+    doc = [1, 1.0, True, 'x', 1]
+    assert replace_value_nested(doc, (1,), callback=tagged, mode='replace') is doc
+    assert doc == [('hit', 'int'), ('hit', 'float'), ('hit', 'bool'), 'x', ('hit', 'int')]
+
+    doc = {'a': 1, 'b': 1.0, 'c': True, 'd': [1.0, 1]}
+    replace_value_nested(doc, (1,), callback=tagged, mode='replace')
+    assert doc == {'a': ('hit', 'int'), 'b': ('hit', 'float'), 'c': ('hit', 'bool'),
+                   'd': [('hit', 'float'), ('hit', 'int')]}
+
+
+def test_replace_keeps_some_equal_values():
+    #The callback keeps every other match; the kept and replaced ones must stay in their own slots
+    seen = []
+    def every_other(old, new, parents):
+        seen.append(len(seen))
+        return new if len(seen) % 2 else old
+
+    doc = [0] * 6
+    replace_value_nested(doc, 0, 'x', every_other, mode='replace')
+    assert doc.count('x') == 3 and doc.count(0) == 3 and len(seen) == 6
+
+
+def test_replace_parents():
+    doc = {'a': [1, {'b': 1}]}
+    found = []
+    def record(old, new, parents):
+        found.append([id(p) for p in parents])
+        return new
+
+    replace_value_nested(doc, 1, 2, record, mode='replace')
+    assert sorted(found, key=len) == [[id(doc['a']), id(doc)], [id(doc['a'][1]), id(doc['a']), id(doc)]]
+    assert doc == {'a': [2, {'b': 2}]}
+
+
+def test_replace_deep_nesting():
+    depth = sys.getrecursionlimit() * 5
+    doc = nested(depth, 'old')
+    replace_value_nested(doc, 'old', 'new', mode='replace')
+    assert leaf_of(doc) == 'new'
+
+
+@pytest.mark.parametrize("mode", ['replace', 'copy'])
+def test_replace_break_search_keeps_earlier_replacements(mode):
+    calls = []
+    def three(old, new):
+        calls.append(old)
+        return new if len(calls) <= 3 else BREAK_SEARCH
+
+    doc = {'a': ['x'] * 4, 'b': {'c': 'x', 'd': ['x', 'x']}}
+    result = replace_value_nested(doc, 'x', 'y', three, mode=mode)
+    flat = result['a'] + [result['b']['c']] + result['b']['d']
+    assert flat.count('y') == 3 and flat.count('x') == 4 and len(calls) == 4
+    assert (result is doc) == (mode == 'replace')
+
+
+
+#'return' mode
+#----------------------------------------------------------------------------------------------------------------------
+
+def test_return_shares_untouched_subtrees():
+    cold = {'deep': [1, 2, (3, 4)], 'set': {5, 6}}
+    hot = [0, ('x', [7]), {'k': 'x'}]
+    doc = {'cold': cold, 'hot': hot, 'tuple': (cold, 'x')}
+    result = replace_value_nested(doc, 'x', 'y')
+
+    assert result == {'cold': cold, 'hot': [0, ('y', [7]), {'k': 'y'}], 'tuple': (cold, 'y')}
+    #The input is untouched
+    assert hot == [0, ('x', [7]), {'k': 'x'}] and doc['tuple'] == (cold, 'x')
+    #Only the containers on the path to a hit are copied
+    assert result is not doc and result['hot'] is not hot
+    assert result['cold'] is cold and result['tuple'][0] is cold
+    assert result['hot'][1][1] is hot[1][1]
+    assert type(result['hot'][1]) is tuple and type(result['tuple']) is tuple
+
+
+def test_return_without_hits_is_the_input():
+    doc = [{'a': [1, 2]}, (3, {4})]
+    assert replace_value_nested(doc, 'missing', 'y') is doc
+
+
+def test_return_writes_the_visited_slot_when_values_repeat():
+    doc = [1, 1.0, True, ('x', 1.0), {'a': True, 'b': 1}]
+    assert replace_value_nested(doc, (1,), callback=tagged) == [
+        ('hit', 'int'), ('hit', 'float'), ('hit', 'bool'), ('x', ('hit', 'float')),
+        {'a': ('hit', 'bool'), 'b': ('hit', 'int')}]
+    assert doc == [1, 1.0, True, ('x', 1.0), {'a': True, 'b': 1}]
+
+
+def test_return_deep_nesting():
+    depth = sys.getrecursionlimit() * 5
+    doc = nested(depth, 'old')
+    result = replace_value_nested(doc, 'old', 'new')
+    assert leaf_of(result) == 'new' and leaf_of(doc) == 'old'
+
+    cold = nested(depth, 'cold')
+    result = replace_value_nested([cold, 'old'], 'old', 'new')
+    assert result[0] is cold and result[1] == 'new'
+
+
+def test_return_break_search_keeps_earlier_replacements():
+    calls = []
+    def three(old, new):
+        calls.append(old)
+        return new if len(calls) <= 3 else BREAK_SEARCH
+
+    doc = {'a': ['x'] * 4, 'b': {'c': 'x', 'd': ('x', 'x')}}
+    result = replace_value_nested(doc, 'x', 'y', three)
+    flat = result['a'] + [result['b']['c']] + list(result['b']['d'])
+    assert flat.count('y') == 3 and flat.count('x') == 4 and len(calls) == 4
+    assert doc == {'a': ['x'] * 4, 'b': {'c': 'x', 'd': ('x', 'x')}}
+
+
+def test_return_root_match():
+    assert replace_value_nested('x', 'x', 'y') == 'y'
+    assert replace_value_nested([1], replace_map=[([1], 'list')]) == 'list'
@@ -0,0 +1,37 @@
+import sys
+import threading
+from macrolibs.misc.sampling import SamplingProfiler
+
+
+def test_reports_while_sampling():
+    #Threads recursing to varying depths keep the sampler inserting new stacks while the reports iterate
+    stop = threading.Event()
+
+    def churn(depth):
+        if depth and not stop.is_set():
+            churn(depth - 1)
+
+    def worker():
+        depth = 0
+        while not stop.is_set():
+            churn(depth)
+            depth = (depth + 1) % 100
+
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    try:
+        with SamplingProfiler(interval=0.0001, rss=False) as sampler:
+            for _ in range(1000):
+                sampler.folded()
+                sampler.folded(per_thread=False)
+                sampler.top()
+                sampler.summary()
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+        sys.setswitchinterval(switch)
+    assert sampler.samples and sum(sampler.snapshot().values()) >= sampler.samples
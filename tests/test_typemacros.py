@@ -0,0 +1,74 @@
+from macrolibs.typemacros import dict_union, type_union, DictUnionView, maybe_arg
+
+
+def test_dict_union_precedence():
+    dicts = [{'a': 1, 'b': 1}, {'a': 2, 'c': 2}, {'c': 3}]
+    assert dict_union(dicts) == {'a': 2, 'b': 1, 'c': 3}
+    assert list(dict_union(dicts)) == ['a', 'b', 'c']
+    assert dict_union(dicts[0], dicts[1]) == dicts[0] | dicts[1]
+    assert type_union([{'a': 1}, {'a': 2}]) == {'a': 2}
+    #DictUnionView is leftmost-wins; reversing the layers gives dict_union's values
+    assert DictUnionView(dicts).materialize() == {'a': 1, 'b': 1, 'c': 2}
+    assert DictUnionView(dicts[::-1]).materialize() == dict_union(dicts)
+
+
+#maybe_arg
+#----------------------------------------------------------------------------------------------------------------------
+
+def args_of(*names):
+    """Function with parameters 'names' (a/b for kinds, '=' for defaults) that returns what it was called with."""
+    namespace = {}
+    exec(f"def f({', '.join(names)}): return dict(locals())", namespace)
+    return namespace['f']
+
+
+def test_maybe_arg_surplus_positionals():
+    f = args_of('x', 'y', 'z=0')
+    assert maybe_arg(f)(1, 2, 3) == {'x': 1, 'y': 2, 'z': 0}
+    assert maybe_arg(f)(1, 2, 3, 4, 5) == {'x': 1, 'y': 2, 'z': 0}
+    assert maybe_arg(f, pass_to_kwargs=True)(1, 2, 3, 4) == {'x': 1, 'y': 2, 'z': 3}
+    assert maybe_arg(f, pass_to_kwargs=True)(1, 2) == {'x': 1, 'y': 2, 'z': 0}
+    assert maybe_arg(args_of('x=1', 'y=2'))(5, 6) == {'x': 5, 'y': 6}
+
+
+def test_maybe_arg_unknown_kwargs():
+    f = args_of('x', 'y', 'z=0')
+    assert maybe_arg(f)(1, 2, z=3, w=4) == {'x': 1, 'y': 2, 'z': 3}
+    #Manually given kwargs overwrite positional ones
+    assert maybe_arg(f, pass_to_kwargs=True)(1, 2, 3, z=9) == {'x': 1, 'y': 2, 'z': 9}
+    assert maybe_arg(args_of('*, k=0'))(1, 2, k=3, j=4) == {'k': 3}
+
+
+def test_maybe_arg_var_args():
+    assert maybe_arg(args_of('x', '*args'))(1, 2, 3, k=4) == {'x': 1, 'args': (2, 3)}
+    assert maybe_arg(args_of('x', '**kwargs'))(1, 2, k=4) == {'x': 1, 'kwargs': {'k': 4}}
+    assert maybe_arg(args_of('*args', '**kwargs'))(1, 2, k=4) == {'args': (1, 2), 'kwargs': {'k': 4}}
+
+
+def test_maybe_arg_kwarg_conflicts_with_positional():
+    #replace_value_nested style callbacks: 'parents' is passed by keyword and may also be a surplus positional
+    f = args_of('old', 'parents')
+    assert maybe_arg(f)(1, 2, parents=[]) == {'old': 1, 'parents': []}
+    assert maybe_arg(f)(1, 2, 3, parents=[], depth=0) == {'old': 1, 'parents': []}
+    assert maybe_arg(args_of('old', 'new', 'parents'))(1, 2, parents=[]) == {'old': 1, 'new': 2, 'parents': []}
+    assert maybe_arg(args_of('old', 'new'))(1, 2, parents=[]) == {'old': 1, 'new': 2}
+    assert maybe_arg(args_of('old=None', 'new=None'), True)(1, 2, 3, 4, parents=[]) == {'old': 1, 'new': 2}
+    assert maybe_arg(args_of('old'))(1, 2, 3, parents=[], depth=0) == {'old': 1}
+
+
+def test_maybe_arg_positional_only():
+    f = args_of('a', 'b=2', '/', 'c=3')
+    assert maybe_arg(f)(1, 5, 6, 7) == {'a': 1, 'b': 2, 'c': 3}
+    assert maybe_arg(f, pass_to_kwargs=True)(1, 5, 6, 7) == {'a': 1, 'b': 5, 'c': 6}
+    assert maybe_arg(f)(1, c=9) == {'a': 1, 'b': 2, 'c': 9}
+    #Positional-only names can't be passed by keyword, so they are ignored like unknown kwargs
+    assert maybe_arg(f)(1, b=0) == {'a': 1, 'b': 2, 'c': 3}
+
+
+def test_maybe_arg_repeated_shapes():
+    #Binding plans are cached per call shape; reusing a shape must not leak kwargs between calls
+    g = maybe_arg(args_of('x', 'y=0'))
+    assert g(1, y=2, z=3) == {'x': 1, 'y': 2}
+    assert g(4, y=5, z=6) == {'x': 4, 'y': 5}
+    assert g(7, z=8, y=9) == {'x': 7, 'y': 9}
+    assert g(1) == {'x': 1, 'y': 0}
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from macrolibs.typemacros import list_union, tuple_union, list_compliment, list_intersect
+from macrolibs.typemacros import _vectorize
+
+
+BIG = list(range(1000))
+
+
+def test_generator_and_iterator_inputs():
+    assert list_union((x for x in range(3)), [1]) == [0, 1, 2]
+    assert list_compliment([1, 2, 3], (x for x in [1])) == [2, 3]
+    assert list_intersect([1, 2, 3], iter([3, 1])) == [1, 3]
+    #Large enough for the NumPy path if these were lists
+    assert list_union(iter(BIG), BIG[::-1]) == BIG
+    assert list_compliment(BIG, (x for x in BIG if x % 2)) == BIG[::2]
+    assert list_intersect(BIG, map(int, BIG[:10])) == BIG[:10]
+    assert list_compliment(iter(BIG), BIG[10:]) == BIG[:10]
+
+
+@pytest.mark.parametrize("vectorize", [None, True, False])
+def test_paths_agree(vectorize):
+    A, B = BIG + [5.5], [float(x) for x in range(500, 1500)]
+    assert list_compliment(BIG, B, vectorize=vectorize) == BIG[:500]
+    assert list_intersect(BIG, B, vectorize=vectorize) == BIG[500:]
+    assert list_union(BIG, B, vectorize=vectorize) == list_union(BIG, B, vectorize=False)
+    assert tuple_union(A, (1, 2), vectorize=vectorize) == tuple(A)
+
+
+def test_strings_are_not_converted_unless_forced(monkeypatch):
+    calls = []
+    asarray = np.asarray
+    monkeypatch.setattr(np, 'asarray', lambda *a, **k: calls.append(1) or asarray(*a, **k))
+    words = [f"w{i}" for i in range(1000)] + ["x" * 2000]
+    assert list_compliment(words, words[:10]) == words[10:]
+    assert calls == []
+    assert list_compliment(words, words[:10], vectorize=True) == words[10:]
+    assert calls
+    #Mixed types are rejected without converting anything
+    calls.clear()
+    assert list_compliment(BIG + ["a"], BIG) == ["a"]
+    assert calls == []
+
+
+def test_nulls_and_wide_ints_fall_back():
+    assert list_union(["a\x00", "a"], ["a"], vectorize=True) == ["a\x00", "a"]
+    big = [2**70 + i for i in range(300)]
+    assert list_compliment(big, big[1:]) == big[:1]
+    assert _vectorize._as_arrays([big], force=True) is None